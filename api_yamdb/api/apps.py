@@ -1,7 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_delete, pre_delete
 from django.dispatch import Signal
 
-from api.utilites import send_confirm_code, update_title_rating
+from api_yamdb.metrics import RATING_UPDATE_DURATION
+from api.utilites import (
+    defer_title_rating_update,
+    enqueue_confirm_code,
+    send_confirm_code,
+    update_ratings,
+    update_title_rating,
+)
 
 
 class ApiV1Config(AppConfig):
@@ -11,13 +20,45 @@ class ApiV1Config(AppConfig):
 
 def update_title_rating_dispatcher(sender, **kwargs):
     title_id = kwargs.get('title_id', None)
-    if title_id is None:
+    score_delta = kwargs.get('score_delta', 0)
+    count_delta = kwargs.get('count_delta', 0)
+    # Правка текста отзыва рейтинг не меняет: кэш каталога не сбрасывается.
+    if title_id is None or not (score_delta or count_delta):
         return
-    update_title_rating(title_id)
+    if settings.RATING_UPDATE_DEFERRED:
+        update, mode = defer_title_rating_update, 'deferred'
+    else:
+        update, mode = update_title_rating, 'inline'
+    with RATING_UPDATE_DURATION.labels(mode).time():
+        update(title_id, score_delta, count_delta)
+
+
+def remember_review_titles(sender, instance, **kwargs):
+    instance._rating_title_ids = list(
+        instance.reviews.values_list('title_id', flat=True)
+    )
+
+
+def recount_review_titles(sender, instance, **kwargs):
+    if instance._rating_title_ids:
+        update_ratings(instance._rating_title_ids)
+
+
+def connect_rating_signals(user):
+    # Отзывы удаленного пользователя удаляются каскадом, минуя
+    # ReviewViewSet.perform_destroy: рейтинг их произведений
+    # пересчитывается после удаления.
+    pre_delete.connect(remember_review_titles, sender=user)
+    post_delete.connect(recount_review_titles, sender=user)
 
 
 def user_registered_dispatcher(sender, **kwargs):
-    send_confirm_code(kwargs['instance'])
+    send = (
+        enqueue_confirm_code
+        if settings.EMAIL_OUTBOX
+        else send_confirm_code
+    )
+    send(kwargs['instance'])
 
 
 signal_need_update_rating = Signal()
@@ -0,0 +1,45 @@
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.urls import URLPattern
+
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def to_async_view(view):
+    # В Django 3.2 нет асинхронного ORM, а DRF не умеет асинхронные
+    # представления, поэтому чтение выполняется в пуле потоков, не занимая
+    # цикл событий, а запись - в общем потоке, как синхронные представления
+    # под ASGI.
+    def run_view(request, *args, **kwargs):
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+        finally:
+            close_old_connections()
+
+    run_read = sync_to_async(run_view, thread_sensitive=False)
+    run_write = sync_to_async(view, thread_sensitive=True)
+
+    @wraps(view)
+    async def async_view(request, *args, **kwargs):
+        if request.method in READ_METHODS:
+            return await run_read(request, *args, **kwargs)
+        return await run_write(request, *args, **kwargs)
+
+    return async_view
+
+
+def as_async_urls(urlpatterns):
+    return [
+        URLPattern(
+            pattern.pattern,
+            to_async_view(pattern.callback),
+            pattern.default_args,
+            pattern.name,
+        )
+        for pattern in urlpatterns
+    ]
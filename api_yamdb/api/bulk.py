@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+
+def bulk_create_with_ids(model, objects):
+    # Без RETURNING (например, SQLite) bulk_create не проставляет id, и
+    # объекты сохраняются по одному. Ограничение этого пути: save()
+    # отправляет post_save на каждый объект, поэтому поисковый индекс
+    # обновляется построчно и переиндексировать пачку не нужно, а
+    # обработчики видят объект еще без связей many-to-many.
+    if connection.features.can_return_rows_from_bulk_insert:
+        model.objects.bulk_create(objects)
+        return
+    for obj in objects:
+        obj.save(force_insert=True)
+
+
+class BulkCreateMixin:
+    bulk_serializer_class = None
+
+    def create(self, request, *args, **kwargs):
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+        return super().create(request, *args, **kwargs)
+
+    def bulk_create(self, request):
+        if len(request.data) > settings.BULK_CREATE_MAX_ITEMS:
+            raise ValidationError({'non_field_errors': [
+                'Не больше {} объектов за запрос.'.format(
+                    settings.BULK_CREATE_MAX_ITEMS
+                )
+            ]})
+
+        results = [None] * len(request.data)
+        items = {}
+        for index, item in enumerate(request.data):
+            serializer = self.bulk_serializer_class(data=item)
+            if serializer.is_valid():
+                items[index] = serializer.validated_data
+            else:
+                results[index] = {'errors': serializer.errors}
+
+        with transaction.atomic():
+            created, errors = self.perform_bulk_create(items)
+        for index, item_errors in errors.items():
+            results[index] = {'errors': item_errors}
+        data = self.get_serializer(
+            self.get_bulk_instances(list(created.values())), many=True
+        ).data
+        for index, item_data in zip(created, data):
+            results[index] = item_data
+
+        return Response(
+            {'created': len(created), 'results': results},
+            status=(
+                status.HTTP_201_CREATED if created
+                else status.HTTP_400_BAD_REQUEST
+            ),
+        )
+
+    def perform_bulk_create(self, items):
+        # items - {индекс в запросе: validated_data} прошедших валидацию
+        # объектов. Вызывается внутри транзакции; возвращает пару словарей с
+        # теми же индексами: созданные объекты и ошибки объектов, которые
+        # создать не удалось. По умолчанию объекты сохраняются по одному,
+        # как serializer.save(); наследники заменяют хук пакетной вставкой.
+        serializer = self.bulk_serializer_class()
+        created = {}
+        errors = {}
+        for index, data in items.items():
+            try:
+                with transaction.atomic():
+                    created[index] = serializer.create(data)
+            except IntegrityError:
+                errors[index] = {'non_field_errors': [
+                    'Объект нарушает ограничения БД.'
+                ]}
+        return created, errors
+
+    def get_bulk_instances(self, instances):
+        return instances
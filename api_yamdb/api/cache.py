@@ -0,0 +1,149 @@
+import hashlib
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from rest_framework.response import Response
+
+from api_yamdb.metrics import count_cache_request
+
+CACHE_QUERY_PARAMS = (
+    'limit', 'offset', 'category', 'genre', 'year', 'name', 'search'
+)
+GENERATION_KEY = 'catalog_generation:{}'
+
+catalog_cache = caches['catalog']
+
+
+def is_process_local(cache):
+    # Такой кэш не виден другим воркерам gunicorn и контейнерам.
+    return isinstance(cache, (LocMemCache, DummyCache))
+
+
+# Сбросы поколений в памяти процесса не видны другим воркерам: такое
+# поколение живет не дольше закэшированного ответа, и ETag устаревает не
+# позже него.
+GENERATION_TIMEOUT = (
+    catalog_cache.default_timeout if is_process_local(catalog_cache) else None
+)
+
+
+# Области поколений отзывов и комментариев: подпись автора в них берется
+# из профиля, поэтому правка пользователя сбрасывает область authors.
+AUTHORS_SCOPE = 'authors'
+
+
+def title_scope(title_id):
+    return f'title:{title_id}'
+
+
+def reviews_scope(title_id):
+    return f'reviews:{title_id}'
+
+
+def comments_scope(review_id):
+    return f'comments:{review_id}'
+
+
+def get_generations(scopes):
+    keys = [GENERATION_KEY.format(scope) for scope in scopes]
+    generations = catalog_cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            catalog_cache.add(key, time.time_ns(), GENERATION_TIMEOUT)
+            generations[key] = catalog_cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def bump_generations(*scopes):
+    # Поколение - время последнего изменения области в наносекундах: из
+    # него же строится Last-Modified (api.conditional). Одновременные сбросы
+    # дают разные значения, и любое из них отличается от прежнего.
+    def bump():
+        catalog_cache.set_many(
+            {GENERATION_KEY.format(scope): time.time_ns() for scope in scopes},
+            GENERATION_TIMEOUT,
+        )
+
+    transaction.on_commit(bump)
+
+
+def bump_review_scope(sender, instance, **kwargs):
+    bump_generations(reviews_scope(instance.title_id))
+
+
+def bump_comment_scope(sender, instance, **kwargs):
+    bump_generations(comments_scope(instance.review_id))
+
+
+def bump_authors_scope(sender, instance, created, **kwargs):
+    if not created:
+        bump_generations(AUTHORS_SCOPE)
+
+
+def connect_generation_signals(review, comment, user):
+    # Отзывы и комментарии меняются не только через API: сигналы ловят
+    # и каскадное удаление вместе с пользователем или отзывом.
+    for model, handler in ((review, bump_review_scope),
+                           (comment, bump_comment_scope)):
+        post_save.connect(handler, sender=model)
+        post_delete.connect(handler, sender=model)
+    post_save.connect(bump_authors_scope, sender=user)
+
+
+class CacheScopeMixin:
+    cache_scope = None
+
+    def get_cache_scopes(self):
+        return (self.cache_scope,)
+
+    def get_scope_generations(self):
+        # Условный миксин проверяет ETag раньше кэширующего: поколения
+        # читаются из кэша один раз на запрос, и попадание в кэш ответов
+        # обходится без БД.
+        if not hasattr(self, '_scope_generations'):
+            self._scope_generations = get_generations(
+                self.get_cache_scopes()
+            )
+        return self._scope_generations
+
+
+class CachedResponseMixin(CacheScopeMixin):
+    def get_cache_key(self, request):
+        params = sorted(
+            (name, value)
+            for name in CACHE_QUERY_PARAMS
+            for value in request.query_params.getlist(name)
+        )
+        generations = self.get_scope_generations()
+        raw_key = (
+            f'{request.scheme}://{request.get_host()}{request.path}'
+            f'?{params}#{generations}'
+        )
+        return 'catalog:' + hashlib.md5(raw_key.encode()).hexdigest()
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key = self.get_cache_key(request)
+        data = catalog_cache.get(key)
+        count_cache_request('catalog', data is not None)
+        if data is not None:
+            return Response(data)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            catalog_cache.set(key, response.data)
+        return response
+
+
+class CachedListMixin(CachedResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
@@ -0,0 +1,55 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from api.cache import CacheScopeMixin
+
+
+def get_validators(generations):
+    etag = 'W/"{}"'.format(
+        hashlib.md5(repr(generations).encode()).hexdigest()
+    )
+    return etag, max(generations) // 10 ** 9
+
+
+def set_validators(response, etag, last_modified):
+    if response.status_code == 200:
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+class ConditionalResponseMixin(CacheScopeMixin):
+    # Валидаторы строятся из поколений областей кэша (api.cache), которые
+    # сбрасываются при каждом изменении данных ответа: проверка не обращается
+    # к БД и не считает строки.
+    def conditional_response(self, handler, request, *args, **kwargs):
+        generations = self.get_scope_generations()
+        if None in generations:
+            # Кэш каталога отключен (DummyCache): валидаторам не из чего
+            # строиться.
+            return handler(request, *args, **kwargs)
+        etag, last_modified = get_validators(generations)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            return response
+        return set_validators(
+            handler(request, *args, **kwargs), etag, last_modified
+        )
+
+
+class ConditionalListMixin(ConditionalResponseMixin):
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().list, request, *args, **kwargs
+        )
+
+
+class ConditionalRetrieveMixin(ConditionalResponseMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
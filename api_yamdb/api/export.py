@@ -0,0 +1,104 @@
+import csv
+import datetime
+import json
+import zlib
+
+from reviews.models import Comment, Review
+from yamdb.models import Category, Genre, Title
+
+# Имя выгрузки -> файл, модель и колонки (заголовок, поле) как в static/data.
+EXPORTS = {
+    'categories': ('category', Category, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'genres': ('genre', Genre, (
+        ('id', 'id'), ('name', 'name'), ('slug', 'slug'),
+    )),
+    'titles': ('titles', Title, (
+        ('id', 'id'), ('name', 'name'), ('year', 'year'),
+        ('category', 'category_id'),
+    )),
+    'genre_title': ('genre_title', Title.genre.through, (
+        ('id', 'id'), ('title_id', 'title_id'), ('genre_id', 'genre_id'),
+    )),
+    'reviews': ('review', Review, (
+        ('id', 'id'), ('title_id', 'title_id'), ('text', 'text'),
+        ('author_id', 'author_id'), ('score', 'score'),
+        ('pub_date', 'pub_date'),
+    )),
+    'comments': ('comments', Comment, (
+        ('id', 'id'), ('review_id', 'review_id'), ('text', 'text'),
+        ('author_id', 'author_id'), ('pub_date', 'pub_date'),
+    )),
+}
+EXPORT_FORMATS = ('csv', 'ndjson')
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+CHUNK_SIZE = 2000
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def get_filename(name, export_format, compress=False):
+    filename = f'{EXPORTS[name][0]}.{export_format}'
+    return f'{filename}.gz' if compress else filename
+
+
+def format_value(value):
+    if isinstance(value, datetime.datetime):
+        return value.astimezone(datetime.timezone.utc).isoformat(
+            timespec='milliseconds'
+        ).replace('+00:00', 'Z')
+    return value
+
+
+def iter_rows(name, chunk_size=CHUNK_SIZE):
+    _, model, columns = EXPORTS[name]
+    queryset = model.objects.order_by('pk').values_list(
+        *[field for _, field in columns]
+    )
+    for row in queryset.iterator(chunk_size=chunk_size):
+        yield [format_value(value) for value in row]
+
+
+def iter_csv(name, chunk_size=CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in EXPORTS[name][2]])
+    for row in iter_rows(name, chunk_size):
+        yield writer.writerow(
+            ['' if value is None else value for value in row]
+        )
+
+
+def iter_ndjson(name, chunk_size=CHUNK_SIZE):
+    headers = [header for header, _ in EXPORTS[name][2]]
+    for row in iter_rows(name, chunk_size):
+        yield json.dumps(dict(zip(headers, row)), ensure_ascii=False) + '\n'
+
+
+def iter_export(name, export_format, compress=False, chunk_size=CHUNK_SIZE):
+    lines = (iter_csv if export_format == 'csv' else iter_ndjson)(
+        name, chunk_size
+    )
+    # Склеиваем строки в блоки, чтобы не отдавать по одной строке за раз.
+    compressor = zlib.compressobj(wbits=31) if compress else None
+    buffer = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= 64 * 1024:
+            data = ''.join(buffer).encode()
+            yield compressor.compress(data) if compressor else data
+            buffer = []
+            size = 0
+    data = ''.join(buffer).encode()
+    if compressor:
+        yield compressor.compress(data) + compressor.flush()
+    elif data:
+        yield data
@@ -0,0 +1,138 @@
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import ISO_8601, fields, relations, serializers
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from api_yamdb.timing import measure
+
+# Поля, значение которых из .values() уже совпадает с представлением DRF.
+PLAIN_FIELDS = (
+    fields.BooleanField,
+    fields.CharField,
+    fields.IntegerField,
+    fields.ReadOnlyField,
+    relations.PrimaryKeyRelatedField,
+    relations.SlugRelatedField,
+)
+UNSUPPORTED_FIELDS = (
+    relations.ManyRelatedField,
+    serializers.BaseSerializer,
+    fields.SerializerMethodField,
+)
+
+
+def get_field_binder(field):
+    return lambda: field.to_representation
+
+
+def get_datetime_binder(field):
+    # Часовой пояс DateTimeField определяется один раз на пачку строк,
+    # а не на каждое значение, как в DateTimeField.to_representation.
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if (
+        not settings.USE_TZ
+        or output_format is None
+        or output_format.lower() != ISO_8601
+    ):
+        return get_field_binder(field)
+
+    def bind():
+        field_timezone = getattr(field, 'timezone', field.default_timezone())
+
+        def to_representation(value):
+            value = value.astimezone(field_timezone).isoformat()
+            if value.endswith('+00:00'):
+                return value[:-6] + 'Z'
+            return value
+
+        return to_representation
+
+    return bind
+
+
+# Сериализует строки .values() так же, как serializer_class: поля
+# разбираются один раз, на строку остаются только выборка и преобразование.
+class ValuesSerializer:
+    def __init__(self, serializer_class):
+        self.columns = []
+        self.fields = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, UNSUPPORTED_FIELDS):
+                raise ImproperlyConfigured(
+                    f'{serializer_class.__name__}.{name}: поле '
+                    f'{type(field).__name__} не поддерживается'
+                )
+            column = '__'.join(field.source_attrs)
+            if isinstance(field, relations.SlugRelatedField):
+                column = f'{column}__{field.slug_field}'
+            if isinstance(field, PLAIN_FIELDS):
+                binder = None
+            elif isinstance(field, fields.DateTimeField):
+                binder = get_datetime_binder(field)
+            else:
+                binder = get_field_binder(field)
+            self.columns.append(column)
+            self.fields.append((name, column, binder))
+
+    def bind(self):
+        return [
+            (name, column, binder and binder())
+            for name, column, binder in self.fields
+        ]
+
+    def to_representation(self, row, bound_fields=None):
+        data = {}
+        for name, column, mapper in bound_fields or self.bind():
+            value = row[column]
+            data[name] = (
+                value if mapper is None or value is None else mapper(value)
+            )
+        return data
+
+    def serialize(self, rows):
+        bound_fields = self.bind()
+        return [self.to_representation(row, bound_fields) for row in rows]
+
+
+@lru_cache(maxsize=None)
+def get_values_serializer(serializer_class):
+    return ValuesSerializer(serializer_class)
+
+
+class ValuesReadMixin:
+    def get_values_serializer(self):
+        return get_values_serializer(self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        if not settings.FAST_SERIALIZATION:
+            return super().list(request, *args, **kwargs)
+        values = self.get_values_serializer()
+        queryset = self.filter_queryset(self.get_queryset()).values(
+            *values.columns
+        )
+        page = self.paginate_queryset(queryset)
+        with measure('serializer'):
+            data = values.serialize(queryset if page is None else page)
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not settings.FAST_SERIALIZATION:
+            return super().retrieve(request, *args, **kwargs)
+        values = self.get_values_serializer()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        row = get_object_or_404(
+            self.filter_queryset(self.get_queryset()).values(*values.columns),
+            **{self.lookup_field: self.kwargs[lookup_url_kwarg]},
+        )
+        self.check_object_permissions(request, row)
+        with measure('serializer'):
+            data = values.to_representation(row)
+        return Response(data)
@@ -0,0 +1,11 @@
+from rest_framework import filters
+
+from yamdb.search import search
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '').strip()
+        if not term:
+            return queryset
+        return search(queryset, term)
@@ -0,0 +1,152 @@
+import base64
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Q
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from api.cache import catalog_cache, get_generations
+
+
+class KeysetPagination(pagination.PageNumberPagination):
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    invalid_cursor_message = 'Некорректный курсор'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        reverse, position = self.decode_cursor(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) == 'true':
+            self.count = queryset.count()
+
+        if position is None:
+            queryset = queryset.order_by('-pub_date', '-id')
+        elif reverse:
+            queryset = queryset.filter(
+                Q(pub_date__gt=position[0])
+                | Q(pub_date=position[0], id__gt=position[1])
+            ).order_by('pub_date', 'id')
+        else:
+            queryset = queryset.filter(
+                Q(pub_date__lt=position[0])
+                | Q(pub_date=position[0], id__lt=position[1])
+            ).order_by('-pub_date', '-id')
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.rows = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.has_next or not self.rows:
+            return None
+        return self.encode_cursor(False, self.rows[-1])
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.has_previous or not self.rows:
+            return None
+        return self.encode_cursor(True, self.rows[0])
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+        try:
+            reverse, pub_date, pk = base64.urlsafe_b64decode(
+                encoded.encode('ascii')
+            ).decode('ascii').split('|')
+            return reverse == '1', (datetime.fromisoformat(pub_date), int(pk))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, reverse, row):
+        if isinstance(row, dict):
+            pub_date, pk = row['pub_date'], row['id']
+        else:
+            pub_date, pk = row.pub_date, row.id
+        raw = f'{int(reverse)}|{pub_date.isoformat()}|{pk}'
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param
+        )
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            base64.urlsafe_b64encode(raw.encode('ascii')).decode('ascii'),
+        )
+
+
+class TitlePagination(pagination.LimitOffsetPagination):
+    count_scope = 'titles-count'
+    filter_params = ('category', 'genre', 'year', 'name', 'search')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        filters = sorted(
+            (name, value)
+            for name in self.filter_params
+            for value in self.request.query_params.getlist(name)
+        )
+        raw_key = '{}{}{}'.format(
+            queryset.model._meta.label,
+            filters,
+            get_generations((self.count_scope,)),
+        )
+        key = 'count:' + hashlib.md5(raw_key.encode()).hexdigest()
+        count = catalog_cache.get(key)
+        if count is None:
+            if not filters:
+                count = self.estimate_count(queryset)
+            if count is None:
+                count = super().get_count(queryset)
+            catalog_cache.set(key, count)
+        return count
+
+    def estimate_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql':
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+        if row is None or row[0] < settings.COUNT_ESTIMATE_THRESHOLD:
+            return None
+        return int(row[0])
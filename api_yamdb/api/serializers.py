@@ -6,11 +6,14 @@ from rest_framework.validators import UniqueTogetherValidator
 
 from api.utilites import CurrentTitleDefault
 from users.models import CustomUser
+from yamdb.listing import build_listing
 from yamdb.models import Category, Genre, Title
 from reviews.models import Comment, Review
 
 
 class CategorySerializer(serializers.ModelSerializer):
+    slug_exists_message = 'Cсылка {} уже существует.'
+
     class Meta:
         model = Category
         fields = ('name', 'slug')
@@ -19,11 +22,15 @@ class CategorySerializer(serializers.ModelSerializer):
     def validate_slug(self, slug):
         slug = slug.lower()
         if Category.objects.filter(slug=slug).exists():
-            raise exceptions.ValidationError(f'Cсылка {slug} уже существует.')
+            raise exceptions.ValidationError(
+                self.slug_exists_message.format(slug)
+            )
         return slug
 
 
 class GenreSerializer(serializers.ModelSerializer):
+    slug_exists_message = 'Жанр {} уже существует.'
+
     class Meta:
         model = Genre
         fields = ('name', 'slug')
@@ -32,7 +39,9 @@ class GenreSerializer(serializers.ModelSerializer):
     def validate_slug(self, slug):
         slug = slug.lower()
         if Genre.objects.filter(slug=slug).exists():
-            raise exceptions.ValidationError(f'Жанр {slug} уже существует.')
+            raise exceptions.ValidationError(
+                self.slug_exists_message.format(slug)
+            )
         return slug
 
 
@@ -71,6 +80,47 @@ class TitleListSerializer(TitleSerializer):
     category = CategorySerializer(read_only=True)
 
 
+class TitleListingSerializer(serializers.BaseSerializer):
+    # Жанры и категория берутся из витрины TitleListing готовыми,
+    # формат ответа совпадает с TitleListSerializer.
+    def to_representation(self, title):
+        listing = getattr(title, 'listing', None) or build_listing(title)
+        return {
+            'id': title.id,
+            'name': title.name,
+            'year': title.year,
+            'rating': title.rating,
+            'description': title.description,
+            'genre': listing.genre,
+            'category': listing.category,
+        }
+
+
+# Сериализаторы пакетного создания проверяют данные без запросов к БД:
+# существование ссылок проверяется одним запросом на весь пакет.
+class CategoryBulkSerializer(CategorySerializer):
+    class Meta(CategorySerializer.Meta):
+        extra_kwargs = {'slug': {'validators': []}}
+
+    def validate_slug(self, slug):
+        return slug.lower()
+
+
+class GenreBulkSerializer(GenreSerializer):
+    class Meta(GenreSerializer.Meta):
+        extra_kwargs = {'slug': {'validators': []}}
+
+    def validate_slug(self, slug):
+        return slug.lower()
+
+
+class TitleBulkSerializer(TitleSerializer):
+    category = serializers.SlugField()
+    genre = serializers.ListField(
+        child=serializers.SlugField(), allow_empty=False
+    )
+
+
 class ReviewSerializer(serializers.ModelSerializer):
     author = serializers.SlugRelatedField(
         read_only=True,
@@ -83,7 +133,7 @@ class ReviewSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('updated_at', 'search_vector')
         model = Review
         read_only_fields = ('title',)
         validators = [
@@ -108,7 +158,7 @@ class CommentSerializer(serializers.ModelSerializer):
     )
 
     class Meta:
-        fields = '__all__'
+        exclude = ('updated_at', 'search_vector')
         model = Comment
         read_only_fields = ('review',)
 
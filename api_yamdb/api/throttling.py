@@ -0,0 +1,93 @@
+import hashlib
+
+from django.core.cache import caches
+from rest_framework.throttling import SimpleRateThrottle
+
+throttle_cache = caches['throttle']
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    # Скользящее окно из двух счетчиков фиксированных окон: текущего и
+    # предыдущего, взятого с весом непрошедшей доли окна. Счетчик
+    # увеличивается атомарными add и incr, поэтому одновременные запросы
+    # разных воркеров не теряют приращений. Атомарный incr между процессами
+    # дают memcached и redis; LocMemCache считает в каждом процессе
+    # отдельно, а FileBasedCache выполняет incr как чтение и запись.
+    # Частота берется из REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'][scope].
+    cache = throttle_cache
+    wait_seconds = None
+
+    def get_ident_key(self, request):
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_key(request)
+        if ident is None:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def increment(self, key):
+        # Окно живет два периода: следующему окну нужен его итог.
+        self.cache.add(key, 0, 2 * self.duration)
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # Ключ вытеснен между add и incr.
+            self.cache.add(key, 1, 2 * self.duration)
+            return 1
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+        window, offset = divmod(self.timer(), self.duration)
+        current = self.increment(f'{self.key}:{int(window)}')
+        previous = self.cache.get(f'{self.key}:{int(window) - 1}', 0)
+        weight = 1 - offset / self.duration
+        if previous * weight + current <= self.num_requests:
+            return True
+        # Запрос отклонен: ждать, пока вклад предыдущего окна не упадет
+        # настолько, чтобы уложиться в лимит, или до следующего окна.
+        if current >= self.num_requests or not previous:
+            self.wait_seconds = self.duration - offset
+        else:
+            allowed_weight = (self.num_requests - current) / previous
+            self.wait_seconds = (weight - allowed_weight) * self.duration
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class IPRateThrottle(SlidingWindowThrottle):
+    def get_ident_key(self, request):
+        return self.get_ident(request)
+
+
+class UsernameRateThrottle(SlidingWindowThrottle):
+    # Имя берется из тела запроса до валидации сериализатором и без
+    # обращения к БД.
+    def get_ident_key(self, request):
+        data = request.data
+        username = data.get('username') if hasattr(data, 'get') else None
+        if not isinstance(username, str) or not username:
+            return None
+        return hashlib.md5(username.lower().encode()).hexdigest()
+
+
+class SignupIPThrottle(IPRateThrottle):
+    scope = 'signup_ip'
+
+
+class SignupUsernameThrottle(UsernameRateThrottle):
+    scope = 'signup_username'
+
+
+class TokenIPThrottle(IPRateThrottle):
+    scope = 'token_ip'
+
+
+class TokenUsernameThrottle(UsernameRateThrottle):
+    scope = 'token_username'
@@ -1,12 +1,16 @@
+from django.conf import settings
 from django.urls.conf import path, include
 from rest_framework.routers import SimpleRouter
 
+from api.async_views import as_async_urls
+
 from api.views import (
     CategoryViewSet,
     GenreViewSet,
     TitleViewSet,
     CommentViewSet,
     ReviewViewSet,
+    export,
     get_token,
     UserViewSet,
     UserSignupSet,
@@ -17,17 +21,22 @@ router_v1.register('categories', CategoryViewSet)
 router_v1.register('genres', GenreViewSet)
 router_v1.register('titles', TitleViewSet)
 router_v1.register(
-    r'titles/(?P<title_id>[^/.]+)/reviews', ReviewViewSet, basename='reviews'
+    r'titles/(?P<title_id>\d+)/reviews', ReviewViewSet, basename='reviews'
 )
 router_v1.register(
-    r'titles/(?P<title_id>[^/.]+)/reviews/(?P<review_id>[^/.]+)/comments',
+    r'titles/(?P<title_id>\d+)/reviews/(?P<review_id>\d+)/comments',
     CommentViewSet,
     basename='comments',
 )
 router_v1.register('users', UserViewSet, basename='user')
 
+router_urls = router_v1.urls
+if settings.ASYNC_VIEWS:
+    router_urls = as_async_urls(router_urls)
+
 urlpatterns = [
-    path('v1/', include(router_v1.urls)),
+    path('v1/', include(router_urls)),
     path('v1/auth/signup/', UserSignupSet.as_view({'post': 'create'})),
     path('v1/auth/token/', get_token),
+    path('v1/export/<str:name>/', export),
 ]
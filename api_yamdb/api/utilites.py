@@ -1,14 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
 from django.template.loader import render_to_string
 from django.core.signing import Signer
-from django.db.models import Avg
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Now, NullIf
+from django.utils import timezone
 from rest_framework.generics import get_object_or_404
 
+from api.cache import bump_generations, title_scope
+from reviews.models import PendingRatingUpdate, Review
+from users.models import OutboxEmail
 from yamdb.models import Title
 
 signer = Signer()
 
 
-def send_confirm_code(user):
+def render_confirm_code(user):
     context = {
         'user': user,
         'sign': signer.sign(user.username),
@@ -21,18 +31,173 @@ def send_confirm_code(user):
         'email/confirmation_code_body.txt',
         context,
     )
+    return subject, body
+
+
+def send_confirm_code(user):
+    user.email_user(*render_confirm_code(user))
+
+
+OUTBOX_RENDERERS = {
+    OutboxEmail.CONFIRMATION_CODE: render_confirm_code,
+}
+
+
+def enqueue_confirm_code(user):
+    # Повторная регистрация в пределах окна не ставит второе письмо: код
+    # подтверждения для пользователя всегда тот же.
+    window_start = timezone.now() - timedelta(
+        seconds=settings.EMAIL_OUTBOX_DEDUPE_WINDOW
+    )
+    duplicate = OutboxEmail.objects.filter(
+        user=user,
+        kind=OutboxEmail.CONFIRMATION_CODE,
+        created_at__gte=window_start,
+    )
+    if not duplicate.exists():
+        OutboxEmail.objects.create(
+            user=user, kind=OutboxEmail.CONFIRMATION_CODE
+        )
+
+
+def retry_email(email, error, now):
+    email.attempts += 1
+    email.last_error = str(error)
+    email.next_attempt_at = now + timedelta(
+        seconds=min(
+            settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1),
+            settings.EMAIL_OUTBOX_MAX_RETRY_DELAY,
+        )
+    )
 
-    user.email_user(subject, body)
 
+def send_outbox_email(email, connection):
+    subject, body = OUTBOX_RENDERERS[email.kind](email.user)
+    EmailMessage(
+        subject, body, to=[email.user.email], connection=connection
+    ).send()
 
-def update_title_rating(title_id):
-    title = Title.objects.filter(id=title_id)
-    if not title.exists():
+
+def send_outbox_emails(emails, now):
+    # Любая ошибка отмечается только у своего письма: исключение из пачки
+    # откатило бы отметки об уже отправленных письмах, и они ушли бы
+    # повторно.
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        for email in emails:
+            retry_email(email, error, now)
         return
-    title = title[0]
-    rating = int(title.reviews.aggregate(Avg("score"))['score__avg'])
-    title.rating = rating if rating > 0 else None
-    title.save()
+    for email in emails:
+        try:
+            send_outbox_email(email, connection)
+        except Exception as error:
+            retry_email(email, error, now)
+        else:
+            email.attempts += 1
+            email.sent_at = now
+    try:
+        connection.close()
+    except Exception:
+        # Письма уже приняты сервером.
+        pass
+
+
+def flush_email_outbox(batch_size=100):
+    now = timezone.now()
+    with transaction.atomic():
+        emails = list(
+            OutboxEmail.objects.select_for_update(
+                skip_locked=True, of=('self',)
+            )
+            .select_related('user')
+            .filter(
+                sent_at__isnull=True,
+                next_attempt_at__lte=now,
+                attempts__lt=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+            )
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        if not emails:
+            return 0
+        send_outbox_emails(emails, now)
+        OutboxEmail.objects.bulk_update(
+            emails, ('attempts', 'sent_at', 'next_attempt_at', 'last_error')
+        )
+    return len(emails)
+
+
+def update_title_rating(title_id, score_delta, count_delta):
+    score_sum = F('score_sum') + score_delta
+    review_count = F('review_count') + count_delta
+    Title.objects.filter(id=title_id).update(
+        score_sum=score_sum,
+        review_count=review_count,
+        rating=score_sum / NullIf(review_count, 0),
+        updated_at=Now(),
+    )
+    # Рейтинг выводится и в списке произведений, а по произведению нельзя
+    # узнать, на каких страницах и с какими фильтрами оно закэшировано:
+    # сбрасывается вся область titles.
+    bump_generations('titles', title_scope(title_id))
+
+
+def update_ratings(title_ids=None):
+    # Пересчитывает рейтинг по отзывам в БД. Отложенные изменения этих
+    # произведений уже учтены в пересчете, поэтому удаляются.
+    titles = Title.objects.all()
+    if title_ids is not None:
+        title_ids = list(title_ids)
+        titles = titles.filter(pk__in=title_ids)
+    reviews = Review.objects.filter(title=OuterRef('pk')).order_by()
+    score_sum = Coalesce(Subquery(
+        reviews.values('title').annotate(total=Sum('score'))
+        .values('total')
+    ), 0)
+    review_count = Coalesce(Subquery(
+        reviews.values('title').annotate(count=Count('id'))
+        .values('count')
+    ), 0)
+    with transaction.atomic():
+        if title_ids is not None:
+            bump_generations('titles', *map(title_scope, title_ids))
+        PendingRatingUpdate.objects.filter(title__in=titles).delete()
+        return titles.update(
+            score_sum=score_sum,
+            review_count=review_count,
+            rating=score_sum / NullIf(review_count, 0),
+            updated_at=Now(),
+        )
+
+
+def defer_title_rating_update(title_id, score_delta, count_delta):
+    PendingRatingUpdate.objects.create(
+        title_id=title_id,
+        score_delta=score_delta,
+        count_delta=count_delta,
+    )
+
+
+def flush_rating_updates(batch_size=10000):
+    with transaction.atomic():
+        ids = list(
+            PendingRatingUpdate.objects.select_for_update(skip_locked=True)
+            .order_by('id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            return 0
+        pending = PendingRatingUpdate.objects.filter(id__in=ids)
+        totals = pending.values('title').annotate(
+            score_delta=Sum('score_delta'), count_delta=Sum('count_delta')
+        ).order_by()
+        for row in totals:
+            update_title_rating(
+                row['title'], row['score_delta'], row['count_delta']
+            )
+        pending.delete()
+    return len(ids)
 
 
 class CurrentTitleDefault:
@@ -1,8 +1,11 @@
 import datetime
+import time
 
 import django_filters
 from django.core.signing import BadSignature
 from django.conf import settings
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 import jwt
 from rest_framework import (
@@ -13,33 +16,72 @@ from rest_framework import (
     status,
     viewsets,
 )
-from rest_framework.decorators import api_view, permission_classes, action
-from rest_framework.exceptions import ValidationError
+from rest_framework.decorators import (
+    action,
+    api_view,
+    authentication_classes,
+    permission_classes,
+    throttle_classes,
+)
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.generics import get_object_or_404
+from rest_framework.relations import SlugRelatedField
 from rest_framework.response import Response
 
 from api.apps import signal_need_update_rating, signal_user_registered
+from api.bulk import BulkCreateMixin, bulk_create_with_ids
+from api.cache import (
+    AUTHORS_SCOPE,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    bump_generations,
+    comments_scope,
+    reviews_scope,
+    title_scope,
+)
+from api.conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from api.export import (
+    CONTENT_TYPES,
+    EXPORT_FORMATS,
+    EXPORTS,
+    get_filename,
+    iter_export,
+)
+from api.fast import ValuesReadMixin
+from api.filters import FullTextSearchFilter
+from api.pagination import KeysetPagination, TitlePagination
 from api.permissions import (
     IsAdminOnly,
     IsAdminOrReadOnly,
     IsAdminModeratorAuthorOrReadOnly,
 )
 from api.serializers import (
+    CategoryBulkSerializer,
     CategorySerializer,
+    GenreBulkSerializer,
     GenreSerializer,
+    TitleBulkSerializer,
+    TitleListingSerializer,
     TitleSerializer,
-    TitleListSerializer,
     CommentSerializer,
     ReviewSerializer,
     CustomUserSerializer,
 )
+from api.throttling import (
+    SignupIPThrottle,
+    SignupUsernameThrottle,
+    TokenIPThrottle,
+    TokenUsernameThrottle,
+)
 from api.utilites import signer
 from yamdb.models import (
     Category,
     Genre,
     Title,
 )
-from reviews.models import Review
+from reviews.models import Comment, Review
+from yamdb.listing import refresh_title_listings
+from users.authentications import forget_cached_user, revoke_user_tokens
 from users.models import CustomUser
 
 
@@ -53,6 +95,9 @@ class TitleFilter(django_filters.FilterSet):
 
 
 class ListCreateDestroyViewSet(
+    ConditionalListMixin,
+    CachedListMixin,
+    BulkCreateMixin,
     viewsets.GenericViewSet,
     mixins.ListModelMixin,
     mixins.CreateModelMixin,
@@ -64,94 +109,294 @@ class ListCreateDestroyViewSet(
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name', 'slug')
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        bump_generations(self.cache_scope)
+
+    def perform_destroy(self, instance):
+        super().perform_destroy(instance)
+        bump_generations(
+            self.cache_scope, 'titles', 'titles-relations', 'titles-count'
+        )
+
+    def perform_bulk_create(self, items):
+        model = self.queryset.model
+        existing = set(model.objects.filter(
+            slug__in=[data['slug'] for data in items.values()]
+        ).values_list('slug', flat=True))
+        created = {}
+        errors = {}
+        for index, data in items.items():
+            if data['slug'] in existing:
+                errors[index] = {'slug': [
+                    self.bulk_serializer_class.slug_exists_message.format(
+                        data['slug']
+                    )
+                ]}
+                continue
+            existing.add(data['slug'])
+            created[index] = model(**data)
+        model.objects.bulk_create(created.values())
+        bump_generations(self.cache_scope)
+        return created, errors
+
 
 class CategoryViewSet(ListCreateDestroyViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    bulk_serializer_class = CategoryBulkSerializer
+    cache_scope = 'categories'
 
 
 class GenreViewSet(ListCreateDestroyViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    bulk_serializer_class = GenreBulkSerializer
+    cache_scope = 'genres'
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    CachedListMixin,
+    CachedRetrieveMixin,
+    BulkCreateMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Title.objects.all()
     permission_classes = (IsAdminOrReadOnly,)
-    pagination_class = pagination.LimitOffsetPagination
-    filter_backends = (DjangoFilterBackend,)
+    pagination_class = TitlePagination
+    filter_backends = (DjangoFilterBackend, FullTextSearchFilter)
     filterset_class = TitleFilter
+    cache_scope = 'titles'
+    bulk_serializer_class = TitleBulkSerializer
+
+    def get_cache_scopes(self):
+        if self.action == 'retrieve':
+            return (title_scope(self.kwargs['pk']), 'titles-relations')
+        return super().get_cache_scopes()
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        bump_generations(self.cache_scope, 'titles-count')
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        bump_generations(
+            self.cache_scope,
+            title_scope(serializer.instance.id),
+            'titles-count',
+        )
+
+    def perform_destroy(self, instance):
+        # Поколения сбрасываются только после удаления: иначе запрос,
+        # пришедший между сбросом и удалением, закэширует старый ответ.
+        # delete() обнуляет id экземпляра, поэтому область берется заранее.
+        scope = title_scope(instance.id)
+        super().perform_destroy(instance)
+        bump_generations(self.cache_scope, scope, 'titles-count')
+
+    def perform_bulk_create(self, items):
+        categories = Category.objects.in_bulk(
+            {data['category'] for data in items.values()}, field_name='slug'
+        )
+        genres = Genre.objects.in_bulk(
+            {slug for data in items.values() for slug in data['genre']},
+            field_name='slug',
+        )
+        created = {}
+        errors = {}
+        for index, data in items.items():
+            item_errors = self.get_missing_relations(data, categories, genres)
+            if item_errors:
+                errors[index] = item_errors
+                continue
+            created[index] = Title(
+                name=data['name'],
+                year=data['year'],
+                description=data.get('description'),
+                category=categories[data['category']],
+            )
+        bulk_create_with_ids(Title, list(created.values()))
+        Title.genre.through.objects.bulk_create(
+            Title.genre.through(title_id=title.id, genre_id=genres[slug].id)
+            for index, title in created.items()
+            for slug in dict.fromkeys(items[index]['genre'])
+        )
+        # Поисковый индекс обновлять не нужно: в PostgreSQL его заполняет
+        # триггер, в SQLite - post_save при построчном сохранении. Витрину
+        # пересобираем в любом случае, так как жанры добавлены после save().
+        refresh_title_listings(title.pk for title in created.values())
+        bump_generations(self.cache_scope, 'titles-count')
+        return created, errors
+
+    def get_missing_relations(self, data, categories, genres):
+        message = SlugRelatedField.default_error_messages['does_not_exist']
+        errors = {}
+        if data['category'] not in categories:
+            errors['category'] = [
+                message.format(slug_name='slug', value=data['category'])
+            ]
+        missing = [slug for slug in data['genre'] if slug not in genres]
+        if missing:
+            errors['genre'] = [
+                message.format(slug_name='slug', value=slug)
+                for slug in missing
+            ]
+        return errors
+
+    def get_bulk_instances(self, instances):
+        titles = Title.objects.select_related('category').prefetch_related(
+            'genre'
+        ).in_bulk([title.pk for title in instances])
+        return [titles[title.pk] for title in instances]
+
+    def get_queryset(self):
+        if self.request.method == 'GET':
+            return Title.objects.select_related('listing')
+        return Title.objects.all()
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
-            return TitleListSerializer
+            return TitleListingSerializer
         return TitleSerializer
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class NestedListMixin:
+    def get_parent_queryset(self):
+        raise NotImplementedError
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page and not self.get_parent_queryset().exists():
+            raise NotFound
+        return page
+
+
+class ReviewViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    NestedListMixin,
+    ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = ReviewSerializer
-    pagination_class = pagination.PageNumberPagination
+    pagination_class = KeysetPagination
     permission_classes = (IsAdminModeratorAuthorOrReadOnly,)
     filter_backends = (
         DjangoFilterBackend,
-        filters.SearchFilter,
+        FullTextSearchFilter,
     )
     filterset_fields = ('author', 'title')
-    search_fields = ('text',)
 
     lookup_field = 'id'
 
     def get_queryset(self):
-        title = get_object_or_404(
-            Title,
-            id=self.kwargs.get('title_id'),
+        return Review.objects.filter(
+            title_id=self.kwargs.get('title_id'),
+        ).select_related('author').only(
+            'id',
+            'text',
+            'score',
+            'pub_date',
+            'updated_at',
+            'title',
+            'author__username',
         )
-        return title.reviews.all()
+
+    def get_cache_scopes(self):
+        # Область произведения отвечает за 404 после его удаления, когда
+        # отзывов, чье удаление сбросило бы область отзывов, не было.
+        title_id = self.kwargs.get('title_id')
+        return (reviews_scope(title_id), title_scope(title_id), AUTHORS_SCOPE)
+
+    def get_parent_queryset(self):
+        return Title.objects.filter(id=self.kwargs.get('title_id'))
 
     def perform_create(self, serializer):
-        serializer.save(
-            author=self.request.user,
-        )
+        with transaction.atomic():
+            review = serializer.save(
+                author=self.request.user,
+            )
 
-        signal_need_update_rating.send(
-            ReviewViewSet, title_id=self.kwargs.get('title_id')
-        )
+            signal_need_update_rating.send(
+                ReviewViewSet,
+                title_id=review.title_id,
+                score_delta=review.score,
+                count_delta=1,
+            )
 
     def perform_update(self, serializer):
-        serializer.save()
-
-        signal_need_update_rating.send(
-            ReviewViewSet, title_id=self.kwargs.get('title_id')
-        )
+        with transaction.atomic():
+            # Оценка читается под блокировкой строки: одновременная правка
+            # того же отзыва иначе посчитает разницу от устаревшей оценки.
+            old_score = Review.objects.select_for_update().values_list(
+                'score', flat=True
+            ).get(pk=serializer.instance.pk)
+            review = serializer.save()
+
+            signal_need_update_rating.send(
+                ReviewViewSet,
+                title_id=review.title_id,
+                score_delta=review.score - old_score,
+                count_delta=0,
+            )
 
     def perform_destroy(self, instance):
-        instance.delete()
-
-        signal_need_update_rating.send(
-            ReviewViewSet, title_id=self.kwargs.get('title_id')
-        )
+        with transaction.atomic():
+            instance.delete()
+
+            signal_need_update_rating.send(
+                ReviewViewSet,
+                title_id=instance.title_id,
+                score_delta=-instance.score,
+                count_delta=-1,
+            )
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(
+    ConditionalListMixin,
+    ConditionalRetrieveMixin,
+    NestedListMixin,
+    ValuesReadMixin,
+    viewsets.ModelViewSet,
+):
     serializer_class = CommentSerializer
-    pagination_class = pagination.PageNumberPagination
+    pagination_class = KeysetPagination
     permission_classes = (IsAdminModeratorAuthorOrReadOnly,)
     filter_backends = (
         DjangoFilterBackend,
-        filters.SearchFilter,
+        FullTextSearchFilter,
     )
     filterset_fields = ('author', 'review')
-    search_fields = ('text',)
 
     lookup_field = 'id'
 
     def get_queryset(self):
-        review = get_object_or_404(
-            Review,
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        ).select_related('author').only(
+            'id',
+            'text',
+            'pub_date',
+            'updated_at',
+            'review',
+            'author__username',
+        )
+
+    def get_cache_scopes(self):
+        return (
+            comments_scope(self.kwargs.get('review_id')),
+            reviews_scope(self.kwargs.get('title_id')),
+            AUTHORS_SCOPE,
+        )
+
+    def get_parent_queryset(self):
+        return Review.objects.filter(
             id=self.kwargs.get('review_id'),
-            title__id=self.kwargs.get('title_id'),
+            title_id=self.kwargs.get('title_id'),
         )
-        return review.comments.all()
 
     def perform_create(self, serializer):
         review = get_object_or_404(
@@ -183,13 +428,18 @@ class UserViewSet(
     def get_user_by_username(self, request, username):
         user = get_object_or_404(CustomUser, username=username)
         if request.method == 'PATCH':
+            access = (user.role, user.is_active)
             serializer = CustomUserSerializer(
                 user, data=request.data, partial=True
             )
             serializer.is_valid(raise_exception=True)
             serializer.save()
+            forget_cached_user(user.id)
+            if access != (user.role, user.is_active):
+                revoke_user_tokens(user.id)
             return Response(serializer.data, status=status.HTTP_200_OK)
         if request.method == 'DELETE':
+            revoke_user_tokens(user.id)
             user.delete()
             return Response(status=status.HTTP_204_NO_CONTENT)
         serializer = CustomUserSerializer(user)
@@ -202,26 +452,41 @@ class UserViewSet(
         permission_classes=(permissions.IsAuthenticated,),
     )
     def get_me_data(self, request):
+        # request.user может быть собран из токена или взят из кэша.
+        user = get_object_or_404(CustomUser, id=request.user.id)
         if request.method == 'PATCH':
             serializer = CustomUserSerializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True,
                 context={'request': request},
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
+            forget_cached_user(user.id)
             return Response(serializer.data, status=status.HTTP_200_OK)
-        serializer = CustomUserSerializer(request.user)
+        serializer = CustomUserSerializer(user)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class UserSignupSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
     queryset = CustomUser.objects.all()
     serializer_class = CustomUserSerializer
+    # Без аутентификации ограничение частоты срабатывает до запросов к БД.
+    authentication_classes = ()
     permission_classes = (permissions.AllowAny,)
+    throttle_classes = (SignupIPThrottle, SignupUsernameThrottle)
 
     def create(self, request, *args, **kwargs):
+        # С EMAIL_OUTBOX пользователь и письмо в очереди сохраняются в одной
+        # транзакции; без него письмо отправляется сразу, и держать
+        # транзакцию открытой на время отправки нельзя.
+        if settings.EMAIL_OUTBOX:
+            with transaction.atomic():
+                return self.signup(request)
+        return self.signup(request)
+
+    def signup(self, request):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid(raise_exception=False):
             self.perform_create(serializer)
@@ -255,7 +520,9 @@ class UserSignupSet(mixins.CreateModelMixin, viewsets.GenericViewSet):
 
 
 @api_view(["POST"])
+@authentication_classes([])
 @permission_classes([permissions.AllowAny])
+@throttle_classes([TokenIPThrottle, TokenUsernameThrottle])
 def get_token(request):
     user_name = request.data.get('username', None)
     if user_name is None:
@@ -287,13 +554,47 @@ def get_token(request):
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    exp_date = datetime.datetime.now() + datetime.timedelta(days=5)
-    unix_time = exp_date.timestamp()
+    now = datetime.datetime.now()
     token = {
         "token_type": "access",
-        "exp": str(int(unix_time)),
+        "iat": int(now.timestamp()),
         "user_id": user.id,
     }
+    if settings.JWT_STATELESS:
+        lifetime = settings.JWT_STATELESS_TOKEN_LIFETIME
+        token.update({
+            "iat_ns": time.time_ns(),
+            "username": user.username,
+            "role": user.role,
+            "is_superuser": user.is_superuser,
+            "is_active": user.is_active,
+        })
+    else:
+        lifetime = settings.JWT_ACCESS_TOKEN_LIFETIME
+    token["exp"] = str(int((now + lifetime).timestamp()))
 
     jwt_token = jwt.encode(token, settings.SECRET_KEY, "HS256")
     return Response({'token': jwt_token}, status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@permission_classes([IsAdminOnly])
+def export(request, name):
+    if name not in EXPORTS:
+        raise NotFound(f'Неизвестная выгрузка: {name}')
+    export_format = request.query_params.get('type', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        raise ValidationError(
+            {'type': f'Допустимые значения: {", ".join(EXPORT_FORMATS)}'}
+        )
+    compress = request.query_params.get('gzip') == 'true'
+    response = StreamingHttpResponse(
+        iter_export(name, export_format, compress),
+        content_type=(
+            'application/gzip' if compress else CONTENT_TYPES[export_format]
+        ),
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{get_filename(name, export_format, compress)}"'
+    )
+    return response
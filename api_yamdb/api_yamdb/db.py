@@ -0,0 +1,73 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.signals import request_finished, request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from api_yamdb.metrics import DB_CONNECTIONS
+
+
+class ConnectionStats:
+    # Считает запросы и физические подключения к БД в процессе.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.connections = 0
+
+    def add_request(self):
+        with self.lock:
+            self.requests += 1
+
+    def add_connection(self):
+        DB_CONNECTIONS.inc()
+        with self.lock:
+            self.connections += 1
+
+    @property
+    def reuse_rate(self):
+        if not self.requests:
+            return None
+        return max(0.0, 1 - self.connections / self.requests)
+
+
+connection_stats = ConnectionStats()
+
+
+def check_connections(sender, **kwargs):
+    connection_stats.add_request()
+    if not settings.DB_CONN_HEALTH_CHECKS:
+        return
+    # Постоянное соединение могло оборваться между запросами (рестарт БД,
+    # таймаут pgbouncer): проверяем его до первого использования, но только
+    # если оно простаивало дольше DB_CONN_HEALTH_CHECK_IDLE, чтобы не
+    # тратить SELECT 1 на каждый запрос под нагрузкой.
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is None:
+            continue
+        idle = now - getattr(connection, 'released_at', 0)
+        if (
+            idle > settings.DB_CONN_HEALTH_CHECK_IDLE
+            and not connection.is_usable()
+        ):
+            connection.close()
+
+
+def release_connections(sender, **kwargs):
+    now = time.monotonic()
+    for connection in connections.all():
+        if connection.connection is not None:
+            connection.released_at = now
+
+
+def count_connection(sender, connection, **kwargs):
+    if not getattr(connection, 'uses_pool', False):
+        connection_stats.add_connection()
+
+
+def connect_connection_signals():
+    request_started.connect(check_connections)
+    request_finished.connect(release_connections)
+    connection_created.connect(count_connection)
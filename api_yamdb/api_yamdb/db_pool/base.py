@@ -0,0 +1,69 @@
+import threading
+
+import psycopg2.extras
+from django.conf import settings
+from django.db.backends.postgresql import base
+from psycopg2 import pool
+
+from api_yamdb.db import connection_stats
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+class ConnectionPool(pool.ThreadedConnectionPool):
+    def _connect(self, key=None):
+        connection_stats.add_connection()
+        return super()._connect(key)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    # Бэкенд PostgreSQL с пулом соединений в процессе: close() возвращает
+    # соединение в пул, а не закрывает его.
+    uses_pool = True
+
+    def get_pool(self):
+        with pools_lock:
+            if self.alias not in pools:
+                pools[self.alias] = ConnectionPool(
+                    self.settings_dict.get('POOL_MIN_SIZE', 1),
+                    self.settings_dict.get('POOL_MAX_SIZE', 10),
+                    **self.get_connection_params(),
+                )
+            return pools[self.alias]
+
+    def get_pooled_connection(self):
+        connection_pool = self.get_pool()
+        connection = connection_pool.getconn()
+        if settings.DB_CONN_HEALTH_CHECKS:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            except psycopg2.Error:
+                connection_pool.putconn(connection, close=True)
+                connection = connection_pool.getconn()
+        return connection
+
+    def get_new_connection(self, conn_params):
+        connection = self.get_pooled_connection()
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+        with self.wrap_database_errors:
+            # Незавершенную транзакцию пул откатывает сам.
+            self.get_pool().putconn(
+                self.connection, close=bool(self.connection.closed)
+            )
@@ -0,0 +1,20 @@
+import os
+import shutil
+
+from prometheus_client import multiprocess
+
+# Подключаются в gunicorn.conf.py и gunicorn_asgi.py. Модуль не создает
+# метрик, поэтому мастер-процесс не пишет файлов в каталог метрик.
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+
+def on_starting(server):
+    # Файлы метрик прошлого запуска.
+    if MULTIPROC_DIR:
+        shutil.rmtree(MULTIPROC_DIR, ignore_errors=True)
+        os.makedirs(MULTIPROC_DIR)
+
+
+def child_exit(server, worker):
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,126 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from api_yamdb.timing import (
+    RequestTiming,
+    current_timing,
+    install_query_recorder,
+)
+
+# С PROMETHEUS_MULTIPROC_DIR каждый процесс пишет значения в свои файлы
+# в этом каталоге, а /metrics суммирует их по всем воркерам gunicorn.
+MULTIPROC_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+if MULTIPROC_DIR:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+REQUESTS = Counter(
+    'yamdb_http_requests_total',
+    'Запросы по представлению и классу статуса ответа.',
+    ['view', 'status'],
+)
+REQUEST_DURATION = Histogram(
+    'yamdb_http_request_duration_seconds',
+    'Время обработки запроса по представлению.',
+    ['view'],
+    buckets=(
+        0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5,
+        5.0, 10.0,
+    ),
+)
+REQUEST_QUERIES = Histogram(
+    'yamdb_http_request_db_queries',
+    'Число SQL-запросов на запрос по представлению.',
+    ['view'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+REQUEST_DB_DURATION = Histogram(
+    'yamdb_http_request_db_duration_seconds',
+    'Время SQL-запросов на запрос по представлению.',
+    ['view'],
+)
+CACHE_REQUESTS = Counter(
+    'yamdb_cache_requests_total',
+    'Обращения к кэшам: catalog - ответы каталога, jwt_user - '
+    'пользователи по токену.',
+    ['cache', 'result'],
+)
+DB_CONNECTIONS = Counter(
+    'yamdb_db_connections_created_total',
+    'Новые физические соединения с БД; доля повторного использования - '
+    '1 - rate(этого счетчика) / rate(yamdb_http_requests_total).',
+)
+RATING_UPDATE_DURATION = Histogram(
+    'yamdb_rating_update_duration_seconds',
+    'Время пересчета рейтинга: inline - сразу в запросе, deferred - '
+    'постановка в очередь, flush - пачка очереди в rating_worker.',
+    ['mode'],
+)
+
+
+def count_cache_request(cache, hit):
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def get_view_name(request):
+    match = request.resolver_match
+    if match is None:
+        return 'unmatched'
+    view = match.func
+    actions = getattr(view, 'actions', None)
+    if actions:
+        method = request.method.lower()
+        return f'{view.cls.__name__}.{actions.get(method, method)}'
+    return view.__name__
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_query_recorder()
+
+    def __call__(self, request):
+        # Если запрос уже замеряет RequestTimingMiddleware, счетчики
+        # SQL-запросов общие.
+        timing = current_timing.get()
+        token = None
+        if timing is None:
+            timing = RequestTiming()
+            token = current_timing.set(timing)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                current_timing.reset(token)
+        view = get_view_name(request)
+        REQUESTS.labels(view, f'{response.status_code // 100}xx').inc()
+        REQUEST_DURATION.labels(view).observe(time.perf_counter() - started)
+        REQUEST_QUERIES.labels(view).observe(timing.queries)
+        REQUEST_DB_DURATION.labels(view).observe(timing.durations['db'])
+        return response
+
+
+def metrics(request):
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(
+        generate_latest(registry), content_type=CONTENT_TYPE_LATEST
+    )
@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -23,6 +24,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api_yamdb.timing.RequestTimingMiddleware',
+    'api_yamdb.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -62,9 +65,51 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', default='postgres'),
         'HOST': os.getenv('DB_HOST', default='db'),
         'PORT': os.getenv('DB_PORT', default='5432'),
+        'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', default='60')),
+        # Под pgbouncer в режиме transaction серверные курсоры не работают.
+        'DISABLE_SERVER_SIDE_CURSORS': os.getenv(
+            'DB_PGBOUNCER', default='False') == 'True',
+        # Размер пула для бэкенда api_yamdb.db_pool.
+        'POOL_MIN_SIZE': int(os.getenv('DB_POOL_MIN_SIZE', default='1')),
+        'POOL_MAX_SIZE': int(os.getenv('DB_POOL_MAX_SIZE', default='10')),
     }
 }
 
+DB_CONN_HEALTH_CHECKS = os.getenv(
+    'DB_CONN_HEALTH_CHECKS', default='True') == 'True'
+DB_CONN_HEALTH_CHECK_IDLE = int(
+    os.getenv('DB_CONN_HEALTH_CHECK_IDLE', default='30'))
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'catalog': {
+        'BACKEND': os.getenv(
+            'CATALOG_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('CATALOG_CACHE_LOCATION', default='catalog'),
+        'TIMEOUT': int(os.getenv('CATALOG_CACHE_TIMEOUT', default='60')),
+    },
+    # Отзыв токенов JWT_STATELESS: кэш должен быть общим для всех воркеров.
+    'auth': {
+        'BACKEND': os.getenv(
+            'AUTH_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('AUTH_CACHE_LOCATION', default='auth'),
+    },
+    # Счетчики ограничения частоты: в продакшене memcached, см. README.
+    'throttle': {
+        'BACKEND': os.getenv(
+            'THROTTLE_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache',
+        ),
+        'LOCATION': os.getenv('THROTTLE_CACHE_LOCATION', default='throttle'),
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -113,9 +158,100 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'users.authentications.JWTAuth',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Регистрация и получение токена: по IP и по имени пользователя.
+    'DEFAULT_THROTTLE_RATES': {
+        'signup_ip': os.getenv('THROTTLE_SIGNUP_IP', default='20/hour'),
+        'signup_username': os.getenv(
+            'THROTTLE_SIGNUP_USERNAME', default='5/hour'),
+        'token_ip': os.getenv('THROTTLE_TOKEN_IP', default='60/hour'),
+        'token_username': os.getenv(
+            'THROTTLE_TOKEN_USERNAME', default='10/hour'),
+    },
+    # Адрес клиента берется из X-Forwarded-For, который выставляет nginx.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', default='1')),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
 }
 
+SEARCH_CONFIG = 'russian'
+
+COUNT_ESTIMATE_THRESHOLD = int(
+    os.getenv('COUNT_ESTIMATE_THRESHOLD', default='100000')
+)
+
+BULK_CREATE_MAX_ITEMS = int(
+    os.getenv('BULK_CREATE_MAX_ITEMS', default='1000')
+)
+
+FAST_SERIALIZATION = os.getenv(
+    'FAST_SERIALIZATION', default='False'
+) == 'True'
+
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', default='False') == 'True'
+
+# Доля запросов с замером SQL и времени (0 - middleware отключен).
+REQUEST_TIMING_SAMPLE_RATE = float(
+    os.getenv('REQUEST_TIMING_SAMPLE_RATE', default='0')
+)
+REQUEST_TIMING_QUERY_BUDGET = int(
+    os.getenv('REQUEST_TIMING_QUERY_BUDGET', default='20')
+)
+
+# Метрики Prometheus и /metrics; для нескольких воркеров gunicorn нужен
+# каталог PROMETHEUS_MULTIPROC_DIR.
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', default='False') == 'True'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api_yamdb.timing': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+JWT_ACCESS_TOKEN_LIFETIME = timedelta(days=5)
+JWT_STATELESS = os.getenv('JWT_STATELESS', default='False') == 'True'
+JWT_STATELESS_TOKEN_LIFETIME = timedelta(
+    minutes=int(os.getenv('JWT_STATELESS_TOKEN_LIFETIME', default='60'))
+)
+JWT_USER_CACHE_SIZE = int(os.getenv('JWT_USER_CACHE_SIZE', default='0'))
+JWT_USER_CACHE_TTL = int(os.getenv('JWT_USER_CACHE_TTL', default='30'))
+
+RATING_UPDATE_DEFERRED = os.getenv(
+    'RATING_UPDATE_DEFERRED', default='False'
+) == 'True'
+RATING_UPDATE_INTERVAL = float(
+    os.getenv('RATING_UPDATE_INTERVAL', default='5')
+)
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'tmp_emails')
+
+EMAIL_OUTBOX = os.getenv('EMAIL_OUTBOX', default='False') == 'True'
+EMAIL_OUTBOX_INTERVAL = float(
+    os.getenv('EMAIL_OUTBOX_INTERVAL', default='5')
+)
+EMAIL_OUTBOX_DEDUPE_WINDOW = int(
+    os.getenv('EMAIL_OUTBOX_DEDUPE_WINDOW', default='300')
+)
+EMAIL_OUTBOX_RETRY_DELAY = int(
+    os.getenv('EMAIL_OUTBOX_RETRY_DELAY', default='30')
+)
+EMAIL_OUTBOX_MAX_RETRY_DELAY = int(
+    os.getenv('EMAIL_OUTBOX_MAX_RETRY_DELAY', default='3600')
+)
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(
+    os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', default='10')
+)
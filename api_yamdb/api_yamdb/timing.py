@@ -0,0 +1,152 @@
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+# Замеры текущего запроса; None - запрос не попал в выборку. ContextVar
+# переносится sync_to_async в потоки, где выполняются асинхронные чтения.
+current_timing = ContextVar('current_timing', default=None)
+
+
+class RequestTiming:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.durations = {'db': 0.0, 'serializer': 0.0, 'render': 0.0}
+        self.active = set()
+
+
+def record_query(execute, sql, params, many, context):
+    timing = current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.queries += 1
+        timing.durations['db'] += time.perf_counter() - started
+
+
+def add_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def install_query_recorder():
+    connection_created.connect(add_query_recorder)
+    for connection in connections.all():
+        add_query_recorder(None, connection)
+
+
+@contextmanager
+def measure(name):
+    timing = current_timing.get()
+    if timing is None or name in timing.active:
+        yield
+        return
+    timing.active.add(name)
+    started = time.perf_counter()
+    db_time = timing.durations['db']
+    try:
+        yield
+    finally:
+        timing.active.discard(name)
+        # Запросы ленивых QuerySet внутри замера уже учтены в db.
+        timing.durations[name] += (
+            time.perf_counter() - started
+            - (timing.durations['db'] - db_time)
+        )
+
+
+def timed(function):
+    def wrapper(*args, **kwargs):
+        with measure('serializer'):
+            return function(*args, **kwargs)
+
+    wrapper.timed = True
+    return wrapper
+
+
+def install_serializer_timing():
+    # Serializer.data и ListSerializer.data получают результат через
+    # BaseSerializer.data, а валидация всегда идет через is_valid, поэтому
+    # достаточно обернуть их в BaseSerializer.
+    base = serializers.BaseSerializer
+    if getattr(base.is_valid, 'timed', False):
+        return
+    base.is_valid = timed(base.is_valid)
+    base.data = property(timed(base.data.fget))
+
+
+class RequestTimingMiddleware:
+    # Для доли REQUEST_TIMING_SAMPLE_RATE запросов считает SQL-запросы и
+    # время БД, сериализации и рендеринга, отдает их в заголовке
+    # Server-Timing и пишет строкой JSON в лог; запросы сверх
+    # REQUEST_TIMING_QUERY_BUDGET пишутся с уровнем WARNING.
+    def __init__(self, get_response):
+        if not settings.REQUEST_TIMING_SAMPLE_RATE:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        install_serializer_timing()
+        install_query_recorder()
+
+    def __call__(self, request):
+        if random.random() >= settings.REQUEST_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+        timing = RequestTiming()
+        token = current_timing.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timing.reset(token)
+        self.report(request, response, timing)
+        return response
+
+    def process_template_response(self, request, response):
+        timing = current_timing.get()
+        if timing is not None:
+            started = time.perf_counter()
+
+            def rendered(response):
+                timing.durations['render'] += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def report(self, request, response, timing):
+        total = time.perf_counter() - timing.started
+        durations = {
+            name: round(seconds * 1000, 2)
+            for name, seconds in timing.durations.items()
+        }
+        durations['total'] = round(total * 1000, 2)
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={duration}'
+            + (f';desc="{timing.queries} queries"' if name == 'db' else '')
+            for name, duration in durations.items()
+        )
+        over_budget = timing.queries > settings.REQUEST_TIMING_QUERY_BUDGET
+        match = request.resolver_match
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            json.dumps({
+                'method': request.method,
+                'path': request.path,
+                'view': match.view_name if match else None,
+                'status': response.status_code,
+                'queries': timing.queries,
+                'over_query_budget': over_budget,
+                **{f'{name}_ms': value for name, value in durations.items()},
+            }),
+        )
@@ -1,7 +1,10 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
 from django.views.generic import TemplateView
 
+from api_yamdb.metrics import metrics
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path(
@@ -11,3 +14,6 @@ urlpatterns = [
     ),
     path('api/', include('api.urls')),
 ]
+
+if settings.METRICS_ENABLED:
+    urlpatterns.append(path('metrics', metrics, name='metrics'))
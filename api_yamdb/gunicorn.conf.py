@@ -0,0 +1,2 @@
+# gunicorn загружает этот файл из рабочего каталога автоматически.
+from api_yamdb.gunicorn_hooks import child_exit, on_starting  # noqa: F401
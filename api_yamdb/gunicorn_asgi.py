@@ -0,0 +1,6 @@
+# Запуск под ASGI: gunicorn -c gunicorn_asgi.py api_yamdb.asgi:application
+from api_yamdb.gunicorn_hooks import child_exit, on_starting  # noqa: F401
+
+bind = '0:8000'
+worker_class = 'uvicorn.workers.UvicornWorker'
+raw_env = ['ASYNC_VIEWS=True']
@@ -4,3 +4,20 @@ from django.apps import AppConfig
 class ReviewsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'reviews'
+
+    def ready(self):
+        from django.contrib.auth import get_user_model
+
+        from api.apps import connect_rating_signals
+        from api.cache import connect_generation_signals
+        from yamdb.search import connect_search_signals
+
+        connect_search_signals(
+            self.get_model('Review'), self.get_model('Comment')
+        )
+        connect_rating_signals(get_user_model())
+        connect_generation_signals(
+            self.get_model('Review'),
+            self.get_model('Comment'),
+            get_user_model(),
+        )
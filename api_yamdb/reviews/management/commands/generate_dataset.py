@@ -0,0 +1,264 @@
+import csv
+import io
+import itertools
+import random
+from array import array
+from datetime import datetime, timedelta, timezone
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Max
+
+from api.utilites import update_ratings
+from reviews.management.commands.import_csv import (
+    keep_auto_now_add,
+    reset_sequences,
+)
+from reviews.models import Comment, Review
+from yamdb.listing import refresh_title_listings
+from yamdb.models import Category, Genre, Title, User
+
+WORDS = (
+    'фильм', 'книга', 'сюжет', 'герой', 'финал', 'автор', 'музыка', 'сцена',
+    'история', 'актер', 'режиссер', 'персонаж', 'диалог', 'мир', 'время',
+    'очень', 'слишком', 'неожиданно', 'скучно', 'интересно', 'сильно',
+    'красивый', 'затянутый', 'живой', 'мрачный', 'смешной', 'главный',
+    'понравился', 'запомнился', 'разочаровал', 'рекомендую', 'пересмотрю',
+)
+# Отсчет дат публикации: от него зависят данные, а не от текущего времени.
+EPOCH = datetime(2020, 1, 1, tzinfo=timezone.utc)
+PERIOD = int(timedelta(days=3 * 365).total_seconds())
+COMMENT_DELAY = int(timedelta(days=30).total_seconds())
+
+
+def copy_objects(model, objects):
+    # COPY ... FROM STDIN в PostgreSQL в разы быстрее INSERT.
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not field.primary_key or objects[0].pk is not None
+    ]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for obj in objects:
+        row = []
+        for field in fields:
+            value = field.get_db_prep_save(
+                getattr(obj, field.attname), connection
+            )
+            row.append('\\N' if value is None else value)
+        writer.writerow(row)
+    buffer.seek(0)
+    quote_name = connection.ops.quote_name
+    columns = ', '.join(quote_name(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f'COPY {quote_name(model._meta.db_table)} ({columns}) '
+            f"FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует воспроизводимый по --seed набор данных для нагрузочного '
+        'тестирования: пользователи, произведения, жанры, отзывы и '
+        'комментарии. Отзывы распределены по закону Ципфа: большая часть '
+        'приходится на несколько произведений с наименьшими id. Данные '
+        'вставляются через COPY (PostgreSQL) или bulk_create пачками, '
+        'рейтинги пересчитываются в конце.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--users', type=int, default=100000)
+        parser.add_argument('--categories', type=int, default=20)
+        parser.add_argument('--genres', type=int, default=50)
+        parser.add_argument('--titles', type=int, default=50000)
+        parser.add_argument('--reviews', type=int, default=1000000)
+        parser.add_argument('--comments', type=int, default=1000000)
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help='Показатель закона Ципфа для популярности произведений.',
+        )
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--prefix', default='gen')
+        parser.add_argument(
+            '--skip-reindex',
+            action='store_true',
+            help='Не перестраивать поисковый индекс после загрузки.',
+        )
+
+    def handle(self, *args, **options):
+        for name in ('users', 'categories', 'genres', 'titles'):
+            if options[name] < 1:
+                raise CommandError(f'--{name} должно быть больше нуля')
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        self.batch_size = options['batch_size']
+        self.insert = (
+            copy_objects if connection.vendor == 'postgresql'
+            else lambda model, objects: model.objects.bulk_create(objects)
+        )
+
+        users = self.generate(User, self.users(options['users']))
+        categories = self.generate(
+            Category, self.slugs(Category, options['categories'], 'category')
+        )
+        genres = self.generate(
+            Genre, self.slugs(Genre, options['genres'], 'genre')
+        )
+        titles = self.generate(
+            Title, self.titles(options['titles'], categories)
+        )
+        self.generate(Title.genre.through, self.genre_links(titles, genres))
+        counts = self.review_counts(
+            options['reviews'], len(titles), len(users), options['skew']
+        )
+        reviews = self.generate(Review, self.reviews(titles, users, counts))
+        self.generate(
+            Comment, self.comments(options['comments'], reviews, users, counts)
+        )
+
+        reset_sequences([
+            User, Category, Genre, Title, Title.genre.through, Review, Comment
+        ])
+        updated = update_ratings()
+        self.stdout.write(f'Пересчитан рейтинг произведений: {updated}')
+        refresh_title_listings()
+        top = max(1, len(counts) // 100)
+        self.stdout.write(
+            f'На 1% самых популярных произведений (id {titles[0]}-'
+            f'{titles[top - 1]}) приходится '
+            f'{sum(counts[:top]) / max(1, sum(counts)):.0%} отзывов'
+        )
+        if not options['skip_reindex']:
+            call_command('reindex', stdout=self.stdout)
+
+    def generate(self, model, objects):
+        # Вставляет объекты пачками и возвращает их id по порядку.
+        ids = array('q')
+        created = 0
+        with transaction.atomic(), keep_auto_now_add(model):
+            while True:
+                batch = list(itertools.islice(objects, self.batch_size))
+                if not batch:
+                    break
+                self.insert(model, batch)
+                ids.extend(obj.pk for obj in batch if obj.pk is not None)
+                created += len(batch)
+        self.stdout.write(f'{model._meta.label}: создано {created}')
+        return ids
+
+    def next_ids(self, model, count):
+        start = (model.objects.aggregate(pk=Max('pk'))['pk'] or 0) + 1
+        return range(start, start + count)
+
+    def text(self, low, high):
+        words = self.rng.choices(WORDS, k=self.rng.randint(low, high))
+        return ' '.join(words).capitalize() + '.'
+
+    def date(self, offset):
+        return EPOCH + timedelta(seconds=offset)
+
+    def users(self, count):
+        for pk in self.next_ids(User, count):
+            username = f'{self.prefix}{pk}'
+            yield User(
+                pk=pk,
+                username=username,
+                email=f'{username}@example.com',
+                password='!',
+                date_joined=self.date(self.rng.randrange(PERIOD)),
+            )
+
+    def slugs(self, model, count, name):
+        for pk in self.next_ids(model, count):
+            yield model(
+                pk=pk,
+                name=f'{name} {pk}',
+                slug=f'{self.prefix}-{name}-{pk}',
+                updated_at=EPOCH,
+            )
+
+    def titles(self, count, categories):
+        for pk in self.next_ids(Title, count):
+            yield Title(
+                pk=pk,
+                name=self.text(1, 4),
+                year=self.rng.randint(1900, 2023),
+                category_id=self.rng.choice(categories),
+                description=self.text(10, 40),
+                updated_at=EPOCH,
+            )
+
+    def genre_links(self, titles, genres):
+        through = Title.genre.through
+        for title_id in titles:
+            for genre_id in self.rng.sample(
+                genres, min(len(genres), self.rng.randint(1, 3))
+            ):
+                yield through(title_id=title_id, genre_id=genre_id)
+
+    def review_counts(self, total, titles, users, skew):
+        # Число отзывов на произведение ~ 1 / rank^skew, но не больше
+        # числа пользователей: один автор - один отзыв на произведение.
+        weights = [1 / rank ** skew for rank in range(1, titles + 1)]
+        scale = total / sum(weights)
+        counts = [min(users, int(weight * scale)) for weight in weights]
+        rest = min(total, titles * users) - sum(counts)
+        for rank in itertools.cycle(range(titles)):
+            if rest <= 0:
+                break
+            if counts[rank] < users:
+                counts[rank] += 1
+                rest -= 1
+        return counts
+
+    def reviews(self, titles, users, counts):
+        self.review_dates = array('q')
+        review_ids = iter(self.next_ids(Review, sum(counts)))
+        for title_id, count in zip(titles, counts):
+            quality = self.rng.randint(3, 9)
+            for author_index in self.rng.sample(range(len(users)), count):
+                offset = self.rng.randrange(PERIOD)
+                self.review_dates.append(offset)
+                score = round(self.rng.gauss(quality, 2))
+                yield Review(
+                    pk=next(review_ids),
+                    title_id=title_id,
+                    author_id=users[author_index],
+                    text=self.text(5, 60),
+                    score=min(10, max(1, score)),
+                    pub_date=self.date(offset),
+                    updated_at=self.date(offset),
+                )
+
+    def comments(self, total, reviews, users, counts):
+        if not reviews:
+            return
+        # Отзывы на популярные произведения обсуждают чаще: вероятность
+        # выбрать произведение пропорциональна квадрату числа его отзывов.
+        starts = [0, *itertools.accumulate(counts)]
+        cum_weights = list(itertools.accumulate(
+            count * count for count in counts
+        ))
+        ranks = self.rng.choices(
+            range(len(counts)), cum_weights=cum_weights, k=total
+        )
+        comment_ids = iter(self.next_ids(Comment, total))
+        for rank in ranks:
+            index = starts[rank] + self.rng.randrange(counts[rank])
+            offset = self.review_dates[index] + self.rng.randrange(
+                COMMENT_DELAY
+            )
+            yield Comment(
+                pk=next(comment_ids),
+                review_id=reviews[index],
+                author_id=self.rng.choice(users),
+                text=self.text(3, 30),
+                pub_date=self.date(offset),
+                updated_at=self.date(offset),
+            )
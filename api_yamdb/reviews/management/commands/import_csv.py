@@ -0,0 +1,195 @@
+import csv
+import os
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.utils.dateparse import parse_datetime
+
+from api.utilites import update_ratings
+from reviews.models import Comment, Review
+from yamdb.listing import refresh_title_listings
+from yamdb.models import Category, Genre, Title, User
+
+# Файл, модель, переименование колонок и внешние ключи (колонка -> модель).
+CSV_FILES = (
+    ('users.csv', User, {}, {}),
+    ('category.csv', Category, {}, {}),
+    ('genre.csv', Genre, {}, {}),
+    ('titles.csv', Title, {'category': 'category_id'}, {
+        'category_id': Category,
+    }),
+    ('genre_title.csv', Title.genre.through, {}, {
+        'title_id': Title,
+        'genre_id': Genre,
+    }),
+    ('review.csv', Review, {}, {'title_id': Title, 'author_id': User}),
+    ('comments.csv', Comment, {}, {'review_id': Review, 'author_id': User}),
+)
+
+
+class IdSet:
+    def __init__(self, ids=()):
+        self.bits = bytearray()
+        for pk in ids:
+            self.add(pk)
+
+    def add(self, pk):
+        index = pk >> 3
+        if index >= len(self.bits):
+            size = max(index + 1, 2 * len(self.bits))
+            self.bits.extend(bytes(size - len(self.bits)))
+        self.bits[index] |= 1 << (pk & 7)
+
+    def __contains__(self, pk):
+        index = pk >> 3
+        return index < len(self.bits) and bool(
+            self.bits[index] & (1 << (pk & 7))
+        )
+
+
+@contextmanager
+def keep_auto_now_add(model):
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now_add', False)
+    ]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+def reset_sequences(models):
+    statements = connection.ops.sequence_reset_sql(no_style(), models)
+    with connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает CSV из static/data пачками через bulk_create, '
+        'по одной транзакции на файл, и пересчитывает рейтинги.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path',
+            default=os.path.join(settings.BASE_DIR, 'static', 'data'),
+            help='Каталог с CSV-файлами.',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument(
+            '--skip-reindex',
+            action='store_true',
+            help='Не перестраивать поисковый индекс после загрузки.',
+        )
+
+    def handle(self, *args, **options):
+        self.id_sets = {}
+        for filename, model, renames, foreign_keys in CSV_FILES:
+            path = os.path.join(options['path'], filename)
+            if not os.path.exists(path):
+                self.stdout.write(f'{filename}: файл не найден, пропущен')
+                continue
+            with transaction.atomic(), keep_auto_now_add(model):
+                created, skipped = self.import_file(
+                    path, model, renames, foreign_keys, options['batch_size']
+                )
+            self.stdout.write(
+                f'{filename}: обработано {created}, '
+                f'пропущено без связанных записей {skipped}'
+            )
+
+        reset_sequences([model for _, model, _, _ in CSV_FILES])
+        updated = update_ratings()
+        self.stdout.write(f'Пересчитан рейтинг произведений: {updated}')
+        refresh_title_listings()
+        if not options['skip_reindex']:
+            call_command('reindex', stdout=self.stdout)
+
+    def get_id_set(self, model):
+        if model not in self.id_sets:
+            self.id_sets[model] = IdSet(
+                model.objects.values_list('pk', flat=True).iterator()
+            )
+        return self.id_sets[model]
+
+    def read_rows(self, path, model, renames, foreign_keys):
+        fields = {
+            field.attname: field for field in model._meta.concrete_fields
+        }
+        parents = {
+            column: self.get_id_set(parent)
+            for column, parent in foreign_keys.items()
+        }
+        with open(path, encoding='utf-8', newline='') as csv_file:
+            for row in csv.DictReader(csv_file):
+                values = {}
+                for column, value in row.items():
+                    column = renames.get(column, column)
+                    if column not in fields:
+                        raise CommandError(
+                            f'{os.path.basename(path)}: '
+                            f'неизвестная колонка {column}'
+                        )
+                    values[column] = self.to_python(fields[column], value)
+                if any(
+                    values[column] is not None and values[column] not in ids
+                    for column, ids in parents.items()
+                ):
+                    self.skipped += 1
+                    continue
+                yield model(**values)
+
+    def to_python(self, field, value):
+        if field.get_internal_type() == 'DateTimeField':
+            return parse_datetime(value)
+        if value == '' and field.null:
+            return None
+        return field.to_python(value)
+
+    def import_file(self, path, model, renames, foreign_keys, batch_size):
+        self.skipped = 0
+        batch = []
+        created = 0
+        for obj in self.read_rows(path, model, renames, foreign_keys):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                created += self.insert(model, batch)
+                batch = []
+        created += self.insert(model, batch)
+        return created, self.skipped
+
+    def insert(self, model, batch):
+        # bulk_create(ignore_conflicts=True) молча пропускает строки,
+        # нарушающие уникальность, поэтому вставленные строки и их id
+        # берутся из БД после вставки.
+        ids = self.get_id_set(model)
+        batch = [obj for obj in batch if obj.pk is None or obj.pk not in ids]
+        if not batch:
+            return 0
+        if any(obj.pk is None for obj in batch):
+            # Без колонки id вставленные строки не отличить от пропущенных:
+            # IdSet модели перечитывается из БД при следующем обращении.
+            before = model.objects.count()
+            model.objects.bulk_create(batch, ignore_conflicts=True)
+            self.id_sets.pop(model, None)
+            return model.objects.count() - before
+        pks = {obj.pk for obj in batch}
+        model.objects.bulk_create(batch, ignore_conflicts=True)
+        inserted = [
+            pk for pk in model.objects.filter(pk__range=(min(pks), max(pks)))
+            .values_list('pk', flat=True).iterator()
+            if pk in pks
+        ]
+        for pk in inserted:
+            ids.add(pk)
+        return len(inserted)
@@ -0,0 +1,66 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from prometheus_client import start_http_server
+
+from api.cache import catalog_cache, is_process_local
+from api.utilites import flush_rating_updates
+from api_yamdb.metrics import RATING_UPDATE_DURATION
+
+
+class Command(BaseCommand):
+    help = (
+        'Применяет отложенные обновления рейтинга, объединяя события '
+        'по каждому произведению.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.RATING_UPDATE_INTERVAL,
+            help='Пауза между проходами в секундах.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=10000,
+            help='Сколько событий обрабатывать за одну транзакцию.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать накопившиеся события и завершиться.',
+        )
+        parser.add_argument(
+            '--metrics-port',
+            type=int,
+            help='Отдавать метрики Prometheus воркера на этом порту.',
+        )
+
+    def handle(self, *args, **options):
+        if is_process_local(catalog_cache):
+            self.stderr.write(
+                'Кэш каталога в памяти процесса: воркер не сбросит кэш '
+                'web, и рейтинг будет устаревать до CATALOG_CACHE_TIMEOUT. '
+                'Настройте общий CATALOG_CACHE_BACKEND/LOCATION.'
+            )
+        if options['metrics_port']:
+            start_http_server(options['metrics_port'])
+        while True:
+            processed = self.flush(options['batch_size'])
+            if processed:
+                self.stdout.write(f'Обработано событий: {processed}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
+
+    def flush(self, batch_size):
+        processed = 0
+        while True:
+            with RATING_UPDATE_DURATION.labels('flush').time():
+                flushed = flush_rating_updates(batch_size)
+            processed += flushed
+            if flushed < batch_size:
+                return processed
@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Sum
+
+from api.utilites import flush_rating_updates, update_ratings
+from reviews.models import PendingRatingUpdate, Review
+from yamdb.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает счетчики оценок и рейтинг произведений по отзывам '
+        'и сообщает о расхождениях.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только показать расхождения, ничего не исправляя.',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            pending = PendingRatingUpdate.objects.count()
+            if pending:
+                self.stdout.write(
+                    f'Необработанных обновлений рейтинга: {pending}'
+                )
+        else:
+            while flush_rating_updates():
+                pass
+
+        totals = {
+            row['title']: (row['total'], row['count'])
+            for row in Review.objects.values('title').annotate(
+                total=Sum('score'), count=Count('id')
+            ).order_by()
+        }
+        titles = Title.objects.only(
+            'id', 'score_sum', 'review_count', 'rating'
+        ).order_by('id')
+
+        drifted = []
+        for title in titles.iterator():
+            score_sum, review_count = totals.get(title.id, (0, 0))
+            rating = score_sum // review_count if review_count else None
+            if (title.score_sum, title.review_count, title.rating) == (
+                score_sum, review_count, rating
+            ):
+                continue
+            self.stdout.write(
+                f'Произведение {title.id}: '
+                f'сумма {title.score_sum} -> {score_sum}, '
+                f'отзывов {title.review_count} -> {review_count}, '
+                f'рейтинг {title.rating} -> {rating}'
+            )
+            drifted.append(title.id)
+
+        if not options['dry_run']:
+            # Счетчики пересчитываются одним UPDATE с подзапросами, а не
+            # записью значений, прочитанных выше: отзывы, добавленные
+            # после чтения, не потеряются.
+            for start in range(0, len(drifted), 1000):
+                update_ratings(drifted[start:start + 1000])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Расхождений найдено: {len(drifted)}'
+            + (' (не исправлены)' if options['dry_run'] and drifted else '')
+        ))
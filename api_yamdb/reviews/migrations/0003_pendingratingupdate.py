@@ -0,0 +1,28 @@
+# Generated by Django 3.2 on 2026-10-18 19:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0002_title_rating_counters'),
+        ('reviews', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingRatingUpdate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score_delta', models.IntegerField(verbose_name='Изменение суммы оценок')),
+                ('count_delta', models.IntegerField(verbose_name='Изменение количества отзывов')),
+                ('title', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pending_rating_updates', to='yamdb.title', verbose_name='Произведение')),
+            ],
+            options={
+                'verbose_name': 'Отложенное обновление рейтинга',
+                'verbose_name_plural': 'Отложенные обновления рейтинга',
+            },
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
 
@@ -34,11 +35,24 @@ class Review(models.Model):
         help_text='Введите дату отзыва',
     )
 
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
+
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         ordering = ['-pub_date']
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
         unique_together = ('title', 'author')
+        indexes = [
+            models.Index(
+                fields=['title', 'pub_date', 'id'],
+                name='review_title_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -77,10 +91,23 @@ class Comment(models.Model):
         help_text='Введите дату комментария',
     )
 
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
+
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         ordering = ['-pub_date']
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = [
+            models.Index(
+                fields=['review', 'pub_date', 'id'],
+                name='comment_review_pub_date_idx',
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -88,3 +115,20 @@ class Comment(models.Model):
             if len(self.text) > settings.MAX_PRESENTATION_LENGTH
             else self.text
         )
+
+
+class PendingRatingUpdate(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        related_name='pending_rating_updates',
+        verbose_name='Произведение',
+    )
+    score_delta = models.IntegerField(verbose_name='Изменение суммы оценок')
+    count_delta = models.IntegerField(
+        verbose_name='Изменение количества отзывов'
+    )
+
+    class Meta:
+        verbose_name = 'Отложенное обновление рейтинга'
+        verbose_name_plural = 'Отложенные обновления рейтинга'
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from users.models import CustomUser
+from users.models import CustomUser, OutboxEmail
 
 
 @admin.register(CustomUser)
@@ -14,3 +14,17 @@ class CustomUserAdmin(admin.ModelAdmin):
         'bio',
         'role',
     )
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'id',
+        'user',
+        'kind',
+        'created_at',
+        'attempts',
+        'next_attempt_at',
+        'sent_at',
+    )
+    list_filter = ('kind',)
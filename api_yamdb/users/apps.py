@@ -4,3 +4,25 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'users'
+
+    def ready(self):
+        from django.conf import settings
+        from django.core.cache import caches
+        from django.core.exceptions import ImproperlyConfigured
+
+        from api.cache import is_process_local
+
+        if settings.JWT_STATELESS and is_process_local(caches['auth']):
+            raise ImproperlyConfigured(
+                'JWT_STATELESS требует общего для всех процессов кэша '
+                'AUTH_CACHE_BACKEND: отзыв токена в кэше одного воркера '
+                'не виден остальным.'
+            )
+        if settings.JWT_USER_CACHE_SIZE > 0 and is_process_local(
+            caches['auth']
+        ):
+            raise ImproperlyConfigured(
+                'JWT_USER_CACHE_SIZE требует общего для всех процессов кэша '
+                'AUTH_CACHE_BACKEND: по метке в нем другие воркеры снимают '
+                'измененного пользователя из своего кэша.'
+            )
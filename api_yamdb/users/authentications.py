@@ -1,14 +1,50 @@
+import copy
+import time
+
 from django.conf import settings
 import jwt
 from django.contrib.auth import get_user_model
+from django.core.cache import caches
 from rest_framework import HTTP_HEADER_ENCODING, authentication
 from rest_framework import exceptions, status
 
+from api_yamdb.metrics import count_cache_request
+from users.cache import LRUCache
+
 AUTH_HEADER_TYPES = ('Bearer',)
 AUTH_HEADER_NAME = 'HTTP_AUTHORIZATION'
 AUTH_HEADER_TYPE_BYTES = set(
     h.encode(HTTP_HEADER_ENCODING) for h in AUTH_HEADER_TYPES
 )
+REVOKED_KEY = 'jwt_revoked_{}'
+CHANGED_KEY = 'jwt_user_changed_{}'
+
+auth_cache = caches['auth']
+user_cache = LRUCache(
+    settings.JWT_USER_CACHE_SIZE, settings.JWT_USER_CACHE_TTL
+)
+
+
+def revoke_user_tokens(user_id):
+    # Время в наносекундах: токен, выданный в ту же секунду после отзыва,
+    # остается действительным.
+    auth_cache.set(
+        REVOKED_KEY.format(user_id),
+        time.time_ns(),
+        int(settings.JWT_STATELESS_TOKEN_LIFETIME.total_seconds()),
+    )
+    user_cache.delete(user_id)
+
+
+def forget_cached_user(user_id):
+    # Кэш пользователей у каждого воркера свой: запись снимается по метке
+    # в общем кэше auth, которая живет не дольше самой записи.
+    auth_cache.set(
+        CHANGED_KEY.format(user_id),
+        time.time_ns(),
+        settings.JWT_USER_CACHE_TTL,
+    )
+    user_cache.delete(user_id)
 
 
 class JWTAuth(authentication.BaseAuthentication):
@@ -56,7 +92,13 @@ class JWTAuth(authentication.BaseAuthentication):
         return parts[1]
 
     def get_valid_token(self, raw_token):
-        return jwt.decode(raw_token, settings.SECRET_KEY, 'HS256')
+        try:
+            return jwt.decode(raw_token, settings.SECRET_KEY, 'HS256')
+        except jwt.InvalidTokenError:
+            raise exceptions.AuthenticationFailed(
+                'Token is invalid or expired',
+                code=status.HTTP_401_UNAUTHORIZED,
+            )
 
     def get_user(self, valid_token):
         if 'user_id' not in valid_token:
@@ -65,13 +107,24 @@ class JWTAuth(authentication.BaseAuthentication):
                 code=status.HTTP_401_UNAUTHORIZED,
             )
 
-        try:
-            user = get_user_model().objects.get(id=valid_token['user_id'])
-        except get_user_model().DoesNotExist:
-            raise exceptions.AuthenticationFailed(
-                'User not found',
-                code=status.HTTP_401_UNAUTHORIZED,
-            )
+        if settings.JWT_STATELESS and 'role' in valid_token:
+            return self.get_stateless_user(valid_token)
+
+        user = self.get_cached_user(valid_token['user_id'])
+        if user is None:
+            # Время берется до чтения: правка, совпавшая с ним, снимет запись.
+            cached_at = time.time_ns()
+            try:
+                user = get_user_model().objects.get(
+                    id=valid_token['user_id']
+                )
+            except get_user_model().DoesNotExist:
+                raise exceptions.AuthenticationFailed(
+                    'User not found',
+                    code=status.HTTP_401_UNAUTHORIZED,
+                )
+            user_cache.set(user.id, (user, cached_at))
+        user = copy.copy(user)
 
         if not user.is_active:
             raise exceptions.AuthenticationFailed(
@@ -79,3 +132,44 @@ class JWTAuth(authentication.BaseAuthentication):
             )
 
         return user
+
+    def get_cached_user(self, user_id):
+        if user_cache.maxsize <= 0:
+            return None
+        user = None
+        entry = user_cache.get(user_id)
+        if entry is not None:
+            marks = auth_cache.get_many(
+                [REVOKED_KEY.format(user_id), CHANGED_KEY.format(user_id)]
+            )
+            if all(mark < entry[1] for mark in marks.values()):
+                user = entry[0]
+            else:
+                user_cache.delete(user_id)
+        count_cache_request('jwt_user', user is not None)
+        return user
+
+    def get_stateless_user(self, valid_token):
+        revoked_at = auth_cache.get(
+            REVOKED_KEY.format(valid_token['user_id'])
+        )
+        issued_at = valid_token.get(
+            'iat_ns', int(valid_token['iat']) * 10 ** 9
+        )
+        if revoked_at is not None and issued_at <= revoked_at:
+            raise exceptions.AuthenticationFailed(
+                'Token has been revoked', code=status.HTTP_401_UNAUTHORIZED
+            )
+
+        if not valid_token['is_active']:
+            raise exceptions.AuthenticationFailed(
+                'User is inactive', code=status.HTTP_401_UNAUTHORIZED
+            )
+
+        return get_user_model()(
+            id=valid_token['user_id'],
+            username=valid_token['username'],
+            role=valid_token['role'],
+            is_superuser=valid_token['is_superuser'],
+            is_active=valid_token['is_active'],
+        )
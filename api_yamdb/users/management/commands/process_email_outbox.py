@@ -0,0 +1,50 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.utilites import flush_email_outbox
+
+
+class Command(BaseCommand):
+    help = (
+        'Отправляет письма из очереди пачками через одно соединение с '
+        'почтовым сервером; неудачные отправки повторяются с растущей '
+        'паузой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.EMAIL_OUTBOX_INTERVAL,
+            help='Пауза между проходами в секундах.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Сколько писем отправлять через одно соединение.',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Отправить накопившиеся письма и завершиться.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = self.flush(options['batch_size'])
+            if processed:
+                self.stdout.write(f'Обработано писем: {processed}')
+            if options['once']:
+                return
+            time.sleep(options['interval'])
+
+    def flush(self, batch_size):
+        processed = 0
+        while True:
+            flushed = flush_email_outbox(batch_size)
+            processed += flushed
+            if flushed < batch_size:
+                return processed
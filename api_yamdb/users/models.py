@@ -1,5 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 ROLE = [('user', 'user'), ('moderator', 'moderator'), ('admin', 'admin')]
 
@@ -29,3 +30,49 @@ class CustomUser(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == ROLE[1][0]
+
+
+class OutboxEmail(models.Model):
+    CONFIRMATION_CODE = 'confirmation_code'
+    KINDS = [(CONFIRMATION_CODE, 'Код подтверждения')]
+
+    user = models.ForeignKey(
+        CustomUser,
+        on_delete=models.CASCADE,
+        related_name='outbox_emails',
+        verbose_name='Получатель',
+    )
+    kind = models.CharField(
+        max_length=32, choices=KINDS, verbose_name='Тип письма'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Дата создания'
+    )
+    next_attempt_at = models.DateTimeField(
+        default=timezone.now, verbose_name='Следующая попытка'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0, verbose_name='Попыток отправки'
+    )
+    sent_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Дата отправки'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Последняя ошибка')
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'],
+                name='outbox_pending_idx',
+                condition=models.Q(sent_at__isnull=True),
+            ),
+            models.Index(
+                fields=['user', 'kind', 'created_at'],
+                name='outbox_user_kind_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()} для {self.user}'
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class YamdbConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'yamdb'
+
+    def ready(self):
+        from api_yamdb.db import connect_connection_signals
+        from yamdb.listing import connect_listing_signals
+        from yamdb.search import connect_search_signals
+
+        connect_search_signals(self.get_model('Title'))
+        connect_listing_signals(
+            self.get_model('Title'),
+            self.get_model('Category'),
+            self.get_model('Genre'),
+        )
+        connect_connection_signals()
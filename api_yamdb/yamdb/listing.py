@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import Prefetch
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+)
+
+from yamdb.models import Genre, Title, TitleListing
+
+CHUNK_SIZE = 1000
+
+
+def serialize_category(category):
+    if category is None:
+        return None
+    return {'name': category.name, 'slug': category.slug}
+
+
+def build_listing(title):
+    return TitleListing(
+        title=title,
+        category=serialize_category(title.category),
+        genre=[
+            {'name': genre.name, 'slug': genre.slug}
+            for genre in title.genre.all()
+        ],
+    )
+
+
+def refresh_title_listings(title_ids=None):
+    titles = Title.objects.order_by('pk')
+    if title_ids is not None:
+        titles = titles.filter(pk__in=list(title_ids))
+    ids = list(titles.values_list('pk', flat=True))
+    for start in range(0, len(ids), CHUNK_SIZE):
+        chunk = ids[start:start + CHUNK_SIZE]
+        listings = [
+            build_listing(title)
+            for title in Title.objects.filter(pk__in=chunk)
+            .select_related('category')
+            .prefetch_related(Prefetch(
+                'genre',
+                queryset=Genre.objects.only('name', 'slug').order_by('slug'),
+            ))
+        ]
+        with transaction.atomic():
+            TitleListing.objects.filter(title_id__in=chunk).delete()
+            TitleListing.objects.bulk_create(listings)
+
+
+def refresh_title(sender, instance, **kwargs):
+    refresh_title_listings([instance.pk])
+
+
+def refresh_title_genres(sender, instance, action, reverse, pk_set,
+                         **kwargs):
+    if action == 'pre_clear' and reverse:
+        instance._listing_title_ids = list(
+            instance.titles.values_list('pk', flat=True)
+        )
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        refresh_title_listings([instance.pk])
+    elif action == 'post_clear':
+        refresh_title_listings(instance._listing_title_ids)
+    else:
+        refresh_title_listings(pk_set)
+
+
+def refresh_category(sender, instance, **kwargs):
+    TitleListing.objects.filter(title__category=instance).update(
+        category=serialize_category(instance)
+    )
+
+
+def refresh_genre(sender, instance, **kwargs):
+    refresh_title_listings(instance.titles.values_list('pk', flat=True))
+
+
+def remember_genre_titles(sender, instance, **kwargs):
+    instance._listing_title_ids = list(
+        instance.titles.values_list('pk', flat=True)
+    )
+
+
+def refresh_deleted_genre(sender, instance, **kwargs):
+    refresh_title_listings(instance._listing_title_ids)
+
+
+def connect_listing_signals(title, category, genre):
+    post_save.connect(refresh_title, sender=title)
+    m2m_changed.connect(refresh_title_genres, sender=title.genre.through)
+    post_save.connect(refresh_category, sender=category)
+    post_save.connect(refresh_genre, sender=genre)
+    pre_delete.connect(remember_genre_titles, sender=genre)
+    post_delete.connect(refresh_deleted_genre, sender=genre)
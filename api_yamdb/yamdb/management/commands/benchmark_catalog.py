@@ -0,0 +1,163 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Max, Q
+
+from api.views import TitleFilter
+from yamdb.models import Category, Genre, Title
+
+CATALOG_INDEXES = (
+    'title_category_year_idx',
+    'title_name_idx',
+    'title_genre_genre_title_idx',
+    'title_name_trgm_idx',
+    'category_name_trgm_idx',
+    'genre_name_trgm_idx',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает планы и время запросов фильтрации и поиска '
+        'произведений с индексами и без них. Все изменения откатываются.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--titles',
+            type=int,
+            default=0,
+            help='Сколько синтетических произведений добавить на время '
+                 'замера (например, 1000000).',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5, help='Повторов каждого запроса.'
+        )
+        parser.add_argument('--batch-size', type=int, default=10000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--explain',
+            action='store_true',
+            help='Вывести планы запросов.',
+        )
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        results = {}
+        with transaction.atomic():
+            if options['titles']:
+                self.populate(options['titles'], options['batch_size'])
+            cases = self.get_cases()
+            self.analyze()
+            results['с индексами'] = self.run_cases(cases, options)
+            self.drop_indexes()
+            self.analyze()
+            results['без индексов'] = self.run_cases(cases, options)
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f'{"запрос":<24}{"без индексов, мс":>20}{"с индексами, мс":>20}'
+        )
+        for name in results['с индексами']:
+            self.stdout.write(
+                f'{name:<24}'
+                f'{results["без индексов"][name]:>20.2f}'
+                f'{results["с индексами"][name]:>20.2f}'
+            )
+
+    def populate(self, count, batch_size):
+        categories = Category.objects.bulk_create(
+            Category(name=f'Категория {i}', slug=f'bench-category-{i}')
+            for i in range(10)
+        )
+        Genre.objects.bulk_create(
+            Genre(name=f'Жанр {i}', slug=f'bench-genre-{i}')
+            for i in range(30)
+        )
+        category_ids = list(
+            Category.objects.filter(
+                slug__in=[category.slug for category in categories]
+            ).values_list('id', flat=True)
+        )
+        genre_ids = list(
+            Genre.objects.filter(slug__startswith='bench-genre-')
+            .values_list('id', flat=True)
+        )
+        last_id = Title.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+
+        for start in range(0, count, batch_size):
+            Title.objects.bulk_create(
+                Title(
+                    name=f'Произведение {i}',
+                    year=random.randint(1900, 2023),
+                    category_id=random.choice(category_ids),
+                )
+                for i in range(start, min(start + batch_size, count))
+            )
+            self.stdout.write(
+                f'Добавлено произведений: {min(start + batch_size, count)}'
+            )
+
+        links = []
+        title_ids = Title.objects.filter(id__gt=last_id).values_list(
+            'id', flat=True
+        )
+        for title_id in title_ids.iterator(chunk_size=batch_size):
+            for genre_id in random.sample(genre_ids, 2):
+                links.append(Title.genre.through(
+                    title_id=title_id, genre_id=genre_id
+                ))
+            if len(links) >= batch_size:
+                Title.genre.through.objects.bulk_create(links)
+                links = []
+        Title.genre.through.objects.bulk_create(links)
+
+    def get_cases(self):
+        title = Title.objects.order_by('?').select_related('category').first()
+        genre = Genre.objects.order_by('?').first()
+        if title is None or genre is None:
+            return {}
+        fragment = title.name[len(title.name) // 2:][:4]
+        return {
+            'category+year': TitleFilter(
+                {'category': title.category.slug, 'year': title.year},
+                queryset=Title.objects.all(),
+            ).qs,
+            'genre': TitleFilter(
+                {'genre': genre.slug}, queryset=Title.objects.all()
+            ).qs,
+            'name': TitleFilter(
+                {'name': title.name}, queryset=Title.objects.all()
+            ).qs,
+            'search title': Title.objects.filter(name__icontains=fragment),
+            'search category': Category.objects.filter(
+                Q(name__icontains=fragment) | Q(slug__icontains=fragment)
+            ),
+        }
+
+    def run_cases(self, cases, options):
+        timings = {}
+        for name, queryset in cases.items():
+            if options['explain']:
+                self.stdout.write(f'--- {name}')
+                self.stdout.write(queryset.order_by('id')[:10].explain())
+            samples = []
+            for _ in range(options['repeat']):
+                started = time.perf_counter()
+                queryset.count()
+                list(queryset.order_by('id')[:10])
+                samples.append((time.perf_counter() - started) * 1000)
+            timings[name] = statistics.median(samples)
+        return timings
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def drop_indexes(self):
+        with connection.cursor() as cursor:
+            for name in CATALOG_INDEXES:
+                cursor.execute(f'DROP INDEX IF EXISTS {name}')
@@ -0,0 +1,72 @@
+import statistics
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+
+from api_yamdb.db import connection_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время обработки запросов с новым соединением с БД на '
+        'каждый запрос и с постоянными соединениями (или пулом, если '
+        'DB_ENGINE=api_yamdb.db_pool). Запросы проходят через WSGI-обработчик '
+        'в процессе, с теми же сигналами начала и конца запроса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/v1/genres/')
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument(
+            '--conn-max-age',
+            type=int,
+            default=60,
+            help='CONN_MAX_AGE для режима постоянных соединений.',
+        )
+
+    def handle(self, *args, **options):
+        self.handler = WSGIHandler()
+        self.environ = RequestFactory()._base_environ(
+            PATH_INFO=options['path'], SERVER_NAME='127.0.0.1'
+        )
+        self.stdout.write(
+            f'{connection.vendor} {connection.settings_dict["ENGINE"]}, '
+            f'{options["path"]}, {options["requests"]} запросов'
+        )
+        modes = (
+            ('CONN_MAX_AGE=0', 0),
+            (f'CONN_MAX_AGE={options["conn_max_age"]}',
+             options['conn_max_age']),
+        )
+        for name, conn_max_age in modes:
+            self.run(name, conn_max_age, options['requests'])
+
+    def run(self, name, conn_max_age, total):
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = conn_max_age
+        self.request()
+        requests, connections = (
+            connection_stats.requests, connection_stats.connections
+        )
+        latencies = []
+        for _ in range(total):
+            started = time.perf_counter()
+            self.request()
+            latencies.append((time.perf_counter() - started) * 1000)
+        requests = connection_stats.requests - requests
+        connections = connection_stats.connections - connections
+        self.stdout.write(
+            f'{name:<18}{statistics.mean(latencies):>8.2f} мс/запрос, '
+            f'p95 {statistics.quantiles(latencies, n=100)[94]:.2f} мс, '
+            f'новых соединений {connections}, '
+            f'повторное использование {1 - connections / requests:.0%}'
+        )
+
+    def request(self):
+        response = self.handler(dict(self.environ), lambda *args: None)
+        if response.status_code != 200:
+            self.stderr.write(f'{response.status_code}')
+        response.close()
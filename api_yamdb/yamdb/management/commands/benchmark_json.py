@@ -0,0 +1,93 @@
+import io
+import itertools
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from api.serializers import (
+    CommentSerializer,
+    ReviewSerializer,
+    TitleListingSerializer,
+)
+from reviews.models import Comment, Review
+from yamdb.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает время рендеринга и разбора JSON стандартным json и '
+        'FastJSONRenderer/FastJSONParser на ответах /titles/, /reviews/ '
+        'и /comments/.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1000,
+            help='Сколько объектов в одном ответе (записи повторяются).',
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20, help='Повторов каждого замера.'
+        )
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write('orjson не установлен, сравнивается json с json')
+        payloads = {
+            'titles': TitleListingSerializer(
+                Title.objects.select_related('listing'), many=True
+            ).data,
+            'reviews': ReviewSerializer(
+                Review.objects.select_related('author'), many=True
+            ).data,
+            'comments': CommentSerializer(
+                Comment.objects.select_related('author'), many=True
+            ).data,
+        }
+        self.stdout.write(
+            f'{"ответ":<12}{"":<10}{"json, мс":>12}{"fast, мс":>12}'
+            f'{"ускорение":>12}'
+        )
+        for name, results in payloads.items():
+            if not results:
+                self.stdout.write(f'{name:<12}нет данных')
+                continue
+            data = {
+                'count': options['rows'],
+                'next': None,
+                'previous': None,
+                'results': list(itertools.islice(
+                    itertools.cycle(results), options['rows']
+                )),
+            }
+            content = JSONRenderer().render(data)
+            if FastJSONRenderer().render(data) != content:
+                raise CommandError(f'{name}: ответы рендереров различаются')
+            self.report(name, 'render', options['repeat'], [
+                lambda: JSONRenderer().render(data),
+                lambda: FastJSONRenderer().render(data),
+            ])
+            self.report(name, 'parse', options['repeat'], [
+                lambda: JSONParser().parse(io.BytesIO(content)),
+                lambda: FastJSONParser().parse(io.BytesIO(content)),
+            ])
+
+    def report(self, name, operation, repeat, functions):
+        timings = []
+        for function in functions:
+            samples = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                function()
+                samples.append((time.perf_counter() - started) * 1000)
+            timings.append(statistics.median(samples))
+        self.stdout.write(
+            f'{name:<12}{operation:<10}{timings[0]:>12.2f}{timings[1]:>12.2f}'
+            f'{timings[0] / timings[1]:>11.1f}x'
+        )
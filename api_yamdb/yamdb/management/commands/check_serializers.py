@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from api.fast import get_values_serializer
+from api.serializers import (
+    CommentSerializer,
+    ReviewSerializer,
+    TitleListingSerializer,
+    TitleListSerializer,
+)
+from reviews.models import Comment, Review
+from yamdb.models import Title
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает побайтно ответы обычных сериализаторов и быстрого пути '
+        'чтения (.values() и витрина произведений) на всех записях.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        cases = (
+            ('titles', Title.objects.all(), self.serialize_titles),
+            ('reviews', Review.objects.all(), self.serialize_values(
+                ReviewSerializer, Review.objects.select_related('author')
+            )),
+            ('comments', Comment.objects.all(), self.serialize_values(
+                CommentSerializer, Comment.objects.select_related('author')
+            )),
+        )
+        mismatches = 0
+        for name, queryset, serialize in cases:
+            ids = list(queryset.order_by('pk').values_list('pk', flat=True))
+            for start in range(0, len(ids), options['chunk_size']):
+                chunk = ids[start:start + options['chunk_size']]
+                for pk, slow, fast in serialize(chunk):
+                    if renderer.render(slow) != renderer.render(fast):
+                        mismatches += 1
+                        self.stdout.write(f'{name} {pk}:\n{slow}\n{fast}')
+            self.stdout.write(f'{name}: проверено {len(ids)}')
+        if mismatches:
+            raise CommandError(f'Расхождений: {mismatches}')
+
+    def serialize_titles(self, ids):
+        slow = TitleListSerializer(
+            Title.objects.filter(pk__in=ids).order_by('pk')
+            .select_related('category').prefetch_related('genre'),
+            many=True,
+        ).data
+        fast = TitleListingSerializer(
+            Title.objects.filter(pk__in=ids).order_by('pk')
+            .select_related('listing'),
+            many=True,
+        ).data
+        return zip(ids, slow, fast)
+
+    def serialize_values(self, serializer_class, queryset):
+        values = get_values_serializer(serializer_class)
+
+        def serialize(ids):
+            chunk = queryset.filter(pk__in=ids).order_by('pk')
+            slow = serializer_class(chunk, many=True).data
+            fast = values.serialize(chunk.values(*values.columns))
+            return zip(ids, slow, fast)
+
+        return serialize
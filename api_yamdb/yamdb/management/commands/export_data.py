@@ -0,0 +1,58 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from api.export import (
+    CHUNK_SIZE,
+    EXPORT_FORMATS,
+    EXPORTS,
+    get_filename,
+    iter_export,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает каталог, отзывы и комментарии в CSV '
+        '(формат static/data) или NDJSON, с постоянным расходом памяти.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'names',
+            nargs='*',
+            help=f'Что выгрузить: {", ".join(EXPORTS)} (по умолчанию всё).',
+        )
+        parser.add_argument(
+            '--format', choices=EXPORT_FORMATS, default='csv'
+        )
+        parser.add_argument(
+            '--gzip', action='store_true', help='Сжимать файлы на лету.'
+        )
+        parser.add_argument(
+            '--output', default='.', help='Каталог для файлов выгрузки.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        unknown = set(options['names']) - set(EXPORTS)
+        if unknown:
+            raise CommandError(
+                f'Неизвестные выгрузки: {", ".join(sorted(unknown))}'
+            )
+        os.makedirs(options['output'], exist_ok=True)
+        for name in options['names'] or EXPORTS:
+            path = os.path.join(options['output'], get_filename(
+                name, options['format'], options['gzip']
+            ))
+            size = 0
+            with open(path, 'wb') as export_file:
+                for chunk in iter_export(
+                    name,
+                    options['format'],
+                    options['gzip'],
+                    options['chunk_size'],
+                ):
+                    export_file.write(chunk)
+                    size += len(chunk)
+            self.stdout.write(f'{path}: {size} байт')
@@ -0,0 +1,96 @@
+import asyncio
+import itertools
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+
+CATALOG_PATHS = (
+    '/api/v1/titles/',
+    '/api/v1/titles/1/',
+    '/api/v1/genres/',
+    '/api/v1/categories/',
+    '/api/v1/titles/1/reviews/',
+    '/api/v1/titles/1/reviews/1/comments/',
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный тест GET-запросов каталога с заданным числом '
+        'одновременных соединений. Запустите его против WSGI- и '
+        'ASGI-развертывания и сравните пропускную способность.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument(
+            '--path',
+            action='append',
+            dest='paths',
+            help='Путь для запросов (можно несколько; по умолчанию '
+                 'списки и карточки каталога).',
+        )
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--token', help='JWT-токен для заголовка.')
+
+    def handle(self, *args, **options):
+        url = urlsplit(options['url'])
+        self.host = url.hostname
+        self.port = url.port or 80
+        headers = f'Host: {url.netloc}\r\nConnection: close\r\n'
+        if options['token']:
+            headers += f'Authorization: Bearer {options["token"]}\r\n'
+        self.headers = headers
+        self.paths = itertools.cycle(options['paths'] or CATALOG_PATHS)
+
+        started = time.perf_counter()
+        latencies, errors = asyncio.run(
+            self.run(options['concurrency'], options['requests'])
+        )
+        elapsed = time.perf_counter() - started
+
+        if len(latencies) < 2:
+            self.stdout.write('Слишком мало запросов для статистики')
+            return
+        quantiles = statistics.quantiles(latencies, n=100)
+        self.stdout.write(
+            f'{options["url"]}: {len(latencies)} запросов, '
+            f'{options["concurrency"]} соединений, ошибок {errors}\n'
+            f'{len(latencies) / elapsed:.1f} запросов/с, '
+            f'p50 {quantiles[49]:.1f} мс, p95 {quantiles[94]:.1f} мс, '
+            f'p99 {quantiles[98]:.1f} мс'
+        )
+
+    async def run(self, concurrency, total):
+        latencies = []
+        errors = 0
+        remaining = iter(range(total))
+
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                ok = await self.fetch(next(self.paths))
+                latencies.append((time.perf_counter() - started) * 1000)
+                errors += not ok
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors
+
+    async def fetch(self, path):
+        try:
+            reader, writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+            writer.write(
+                f'GET {path} HTTP/1.1\r\n{self.headers}\r\n'.encode()
+            )
+            response = await reader.read()
+            writer.close()
+        except OSError:
+            return False
+        status = response.split(b' ', 2)[1:2]
+        return bool(status) and status[0].startswith((b'2', b'3'))
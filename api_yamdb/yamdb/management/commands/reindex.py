@@ -0,0 +1,46 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from yamdb.search import SEARCH_FIELDS, get_search_fields, index_objects
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает полнотекстовый поисковый индекс пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models',
+            nargs='*',
+            help='Модели для переиндексации, например reviews.Review '
+                 '(по умолчанию все).',
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        labels = options['models'] or list(SEARCH_FIELDS)
+        for label in labels:
+            if label not in SEARCH_FIELDS:
+                raise CommandError(f'Модель {label} не индексируется.')
+            self.reindex(apps.get_model(label), options['batch_size'])
+
+    def reindex(self, model, batch_size):
+        queryset = model.objects.order_by('pk').only(
+            'pk', *get_search_fields(model)
+        )
+        indexed = 0
+        batch = []
+        for obj in queryset.iterator(chunk_size=batch_size):
+            batch.append(obj)
+            if len(batch) >= batch_size:
+                indexed += self.flush(model, batch)
+                batch = []
+        indexed += self.flush(model, batch)
+        self.stdout.write(self.style.SUCCESS(
+            f'{model._meta.label}: проиндексировано {indexed}'
+        ))
+
+    def flush(self, model, batch):
+        with transaction.atomic():
+            index_objects(model, batch)
+        return len(batch)
@@ -0,0 +1,46 @@
+# Generated by Django 3.2 on 2026-10-18 20:02
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+SEARCH_TABLES = ('yamdb_title',)
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table in SEARCH_TABLES:
+        if vendor == 'postgresql':
+            schema_editor.execute(
+                f'CREATE INDEX {table}_search_idx ON {table} '
+                f'USING gin (search_vector)'
+            )
+        elif vendor == 'sqlite':
+            schema_editor.execute(
+                f'CREATE VIRTUAL TABLE {table}_fts USING fts5(body)'
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for table in SEARCH_TABLES:
+        if vendor == 'postgresql':
+            schema_editor.execute(f'DROP INDEX {table}_search_idx')
+        elif vendor == 'sqlite':
+            schema_editor.execute(f'DROP TABLE {table}_fts')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0004_catalog_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='title',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
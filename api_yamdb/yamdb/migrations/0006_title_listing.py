@@ -0,0 +1,53 @@
+# Generated by Django 3.2 on 2026-10-18 20:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_title_listings(apps, schema_editor):
+    Title = apps.get_model('yamdb', 'Title')
+    TitleListing = apps.get_model('yamdb', 'TitleListing')
+    ids = list(Title.objects.order_by('pk').values_list('pk', flat=True))
+    for start in range(0, len(ids), 1000):
+        titles = Title.objects.filter(
+            pk__in=ids[start:start + 1000]
+        ).select_related('category').prefetch_related('genre')
+        TitleListing.objects.bulk_create(
+            TitleListing(
+                title=title,
+                category=(
+                    {'name': title.category.name, 'slug': title.category.slug}
+                    if title.category else None
+                ),
+                genre=[
+                    {'name': genre.name, 'slug': genre.slug}
+                    for genre in title.genre.all()
+                ],
+            )
+            for title in titles
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0005_search_vector'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TitleListing',
+            fields=[
+                ('title', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='listing', serialize=False, to='yamdb.title', verbose_name='Произведение')),
+                ('category', models.JSONField(help_text='Сериализованная категория произведения', null=True, verbose_name='Категория')),
+                ('genre', models.JSONField(default=list, help_text='Сериализованные жанры произведения', verbose_name='Жанры')),
+            ],
+            options={
+                'verbose_name': 'Витрина произведения',
+                'verbose_name_plural': 'Витрина произведений',
+            },
+        ),
+        migrations.RunPython(
+            fill_title_listings, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db import migrations
+
+
+# Таблица -> колонки, из которых PostgreSQL собирает search_vector.
+SEARCH_TABLES = {
+    'yamdb_title': ('name', 'description'),
+}
+
+
+def create_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table, columns in SEARCH_TABLES.items():
+        columns = ', '.join(columns)
+        # UPDATE OF: обновления, не затрагивающие эти колонки (например,
+        # пересчет рейтинга), вектор не пересчитывают.
+        schema_editor.execute(
+            f'CREATE TRIGGER {table}_search_vector_trg '
+            f'BEFORE INSERT OR UPDATE OF {columns} ON {table} '
+            f'FOR EACH ROW EXECUTE PROCEDURE tsvector_update_trigger('
+            f"search_vector, 'pg_catalog.{settings.SEARCH_CONFIG}', "
+            f'{columns})'
+        )
+
+
+def drop_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in SEARCH_TABLES:
+        schema_editor.execute(
+            f'DROP TRIGGER {table}_search_vector_trg ON {table}'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('yamdb', '0006_title_listing'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_triggers, drop_search_triggers),
+    ]
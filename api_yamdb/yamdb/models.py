@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 User = get_user_model()
@@ -18,6 +19,11 @@ class Category(models.Model):
         help_text='Введите ссылку',
     )
 
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
+
     class Meta:
         verbose_name = 'Категория'
         verbose_name_plural = 'Категории'
@@ -43,6 +49,11 @@ class Genre(models.Model):
         help_text='Введите ссылку',
     )
 
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
+
     class Meta:
         verbose_name = 'Жанр'
         verbose_name_plural = 'Жанры'
@@ -70,6 +81,16 @@ class Title(models.Model):
         null=True,
         default=None,
     )
+    score_sum = models.PositiveIntegerField(
+        verbose_name='Сумма оценок',
+        help_text='Сумма оценок всех отзывов на произведение',
+        default=0,
+    )
+    review_count = models.PositiveIntegerField(
+        verbose_name='Количество отзывов',
+        help_text='Количество отзывов на произведение',
+        default=0,
+    )
     description = models.TextField(
         null=True,
         blank=True,
@@ -91,9 +112,22 @@ class Title(models.Model):
         help_text='Выберите категорию',
     )
 
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name='Дата изменения',
+    )
+
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
+        indexes = [
+            models.Index(
+                fields=['category', 'year'], name='title_category_year_idx'
+            ),
+            models.Index(fields=['name'], name='title_name_idx'),
+        ]
 
     def __str__(self):
         return (
@@ -101,3 +135,30 @@ class Title(models.Model):
             if len(self.name) > settings.MAX_PRESENTATION_LENGTH
             else self.name
         )
+
+
+class TitleListing(models.Model):
+    title = models.OneToOneField(
+        Title,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name='listing',
+        verbose_name='Произведение',
+    )
+    category = models.JSONField(
+        null=True,
+        verbose_name='Категория',
+        help_text='Сериализованная категория произведения',
+    )
+    genre = models.JSONField(
+        default=list,
+        verbose_name='Жанры',
+        help_text='Сериализованные жанры произведения',
+    )
+
+    class Meta:
+        verbose_name = 'Витрина произведения'
+        verbose_name_plural = 'Витрина произведений'
+
+    def __str__(self):
+        return str(self.title)
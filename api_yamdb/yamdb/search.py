@@ -0,0 +1,111 @@
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+)
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+
+SEARCH_FIELDS = {
+    'yamdb.Title': ('name', 'description'),
+    'reviews.Review': ('text',),
+    'reviews.Comment': ('text',),
+}
+
+
+def get_search_fields(model):
+    return SEARCH_FIELDS[model._meta.label]
+
+
+def get_fts_table(model):
+    return f'{model._meta.db_table}_fts'
+
+
+def get_fts_query(term):
+    return ' '.join(
+        '"{}"'.format(word.replace('"', '""')) for word in term.split()
+    )
+
+
+def index_objects(model, objects):
+    objects = list(objects)
+    if not objects:
+        return
+    fields = get_search_fields(model)
+    if connection.vendor == 'postgresql':
+        model.objects.filter(pk__in=[obj.pk for obj in objects]).update(
+            search_vector=SearchVector(*fields, config=settings.SEARCH_CONFIG)
+        )
+    elif connection.vendor == 'sqlite':
+        table = get_fts_table(model)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'DELETE FROM {table} WHERE rowid = %s',
+                [(obj.pk,) for obj in objects],
+            )
+            cursor.executemany(
+                f'INSERT INTO {table} (rowid, body) VALUES (%s, %s)',
+                [
+                    (
+                        obj.pk,
+                        ' '.join(
+                            getattr(obj, field) or '' for field in fields
+                        ),
+                    )
+                    for obj in objects
+                ],
+            )
+
+
+def remove_objects(model, pks):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {get_fts_table(model)} WHERE rowid = %s',
+            [(pk,) for pk in pks],
+        )
+
+
+def search(queryset, term):
+    model = queryset.model
+    if connection.vendor == 'postgresql':
+        query = SearchQuery(term, config=settings.SEARCH_CONFIG)
+        return queryset.annotate(
+            rank=SearchRank(F('search_vector'), query)
+        ).filter(search_vector=query).order_by('-rank', '-pk')
+    if connection.vendor == 'sqlite':
+        table = get_fts_table(model)
+        match = get_fts_query(term)
+        return queryset.annotate(rank=RawSQL(
+            f'SELECT rank FROM {table} WHERE {table} MATCH %s '
+            f'AND rowid = {model._meta.db_table}.{model._meta.pk.column}',
+            [match],
+        )).filter(pk__in=RawSQL(
+            f'SELECT rowid FROM {table} WHERE {table} MATCH %s', [match]
+        )).order_by('rank', '-pk')
+    condition = Q()
+    for field in get_search_fields(model):
+        condition |= Q(**{f'{field}__icontains': term})
+    return queryset.filter(condition)
+
+
+def update_search_index(sender, instance, **kwargs):
+    index_objects(sender, [instance])
+
+
+def remove_from_search_index(sender, instance, **kwargs):
+    remove_objects(sender, [instance.pk])
+
+
+def connect_search_signals(*models):
+    # В PostgreSQL search_vector заполняет триггер БД (миграции
+    # *_search_vector_trigger), из Python индексируется только FTS5 в SQLite.
+    if connection.vendor != 'sqlite':
+        return
+    for model in models:
+        post_save.connect(update_search_index, sender=model)
+        post_delete.connect(remove_from_search_index, sender=model)
@@ -1,9 +1,42 @@
 import sys
 from os.path import abspath, dirname, join
 
+import pytest
+
 root_dir = dirname(dirname(abspath(__file__)))
 sys.path.append(root_dir)
 infra_dir_path = join(root_dir, 'infra')
 
 pytest_plugins = [
 ]
+
+
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings():
+    # Тесты с БД идут на SQLite в памяти: настройки проекта указывают на
+    # PostgreSQL из docker-compose. Подменяется только соединение, модуль
+    # настроек остается прежним (его проверяет test_settings).
+    from django.db import connections
+    from django.db.utils import load_backend
+
+    engine = 'django.db.backends.sqlite3'
+    settings_dict = {
+        **connections['default'].settings_dict,
+        'ENGINE': engine,
+        'NAME': ':memory:',
+        'OPTIONS': {},
+    }
+    connections['default'] = load_backend(engine).DatabaseWrapper(
+        settings_dict, 'default'
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_catalog_cache():
+    # Ответы каталога кэшируются в памяти процесса, а поколения кэша
+    # сбрасываются в on_commit, который в тестах с откатом не вызывается.
+    from api.cache import catalog_cache
+
+    catalog_cache.clear()
+    yield
+    catalog_cache.clear()
@@ -0,0 +1,145 @@
+import pytest
+from rest_framework.test import APIClient
+
+from api.cache import catalog_cache
+from reviews.models import Comment, Review
+from yamdb.models import Category, Genre, Title
+
+API_URL = '/api/v1/'
+ENDPOINTS = (
+    'categories/',
+    'genres/',
+    'titles/',
+    'titles/?limit=2&offset=1',
+    'titles/{title}/',
+    'titles/{title}/reviews/',
+    'titles/{title}/reviews/?page=2',
+    'titles/{title}/reviews/?cursor=',
+    'titles/{title}/reviews/?cursor=&count=true',
+    'titles/{title}/reviews/?author={author}',
+    'titles/{title}/reviews/{review}/',
+    'titles/{title}/reviews/{review}/comments/',
+    'titles/{title}/reviews/{review}/comments/?page=2',
+    'titles/{title}/reviews/{review}/comments/?cursor=',
+    'titles/{title}/reviews/{review}/comments/{comment}/',
+    'users/',
+    'users/{username}/',
+)
+NOT_FOUND_ENDPOINTS = (
+    'titles/0/reviews/',
+    'titles/{title}/reviews/0/',
+    'titles/{title}/reviews/{review}/comments/0/',
+    'titles/{title}/reviews/?cursor=broken',
+)
+
+
+@pytest.fixture
+def catalog(db, django_user_model):
+    admin = django_user_model.objects.create(
+        username='admin', email='admin@example.com', role='admin'
+    )
+    authors = [
+        django_user_model.objects.create(
+            username=f'author{index}',
+            email=f'author{index}@example.com',
+            bio=f'О себе {index}',
+        )
+        for index in range(8)
+    ]
+    category = Category.objects.create(name='Книги', slug='books')
+    genre = Genre.objects.create(name='Сказка', slug='tale')
+    titles = []
+    for index in range(3):
+        title = Title.objects.create(
+            name=f'Произведение {index}',
+            year=2000 + index,
+            description=f'Описание {index}',
+            category=category,
+        )
+        title.genre.add(genre)
+        titles.append(title)
+    reviews = [
+        Review.objects.create(
+            title=titles[0],
+            author=author,
+            text=f'Отзыв «{index}»\nс переносом строки',
+            score=1 + index % 10,
+        )
+        for index, author in enumerate(authors)
+    ]
+    comments = [
+        Comment.objects.create(
+            review=reviews[0], author=author, text=f'Комментарий {index}'
+        )
+        for index, author in enumerate(authors)
+    ]
+    return {
+        'admin': admin,
+        'title': titles[0].id,
+        'author': authors[0].id,
+        'review': reviews[0].id,
+        'comment': comments[0].id,
+        'username': authors[0].username,
+    }
+
+
+@pytest.fixture
+def api_client(catalog):
+    client = APIClient()
+    client.force_authenticate(user=catalog['admin'])
+    return client
+
+
+def get_both(client, settings, url):
+    # Тела ответов с FAST_SERIALIZATION выключенным и включенным; кэш
+    # каталога сбрасывается, чтобы второй ответ не пришел из кэша первого.
+    responses = []
+    for fast in (False, True):
+        settings.FAST_SERIALIZATION = fast
+        catalog_cache.clear()
+        responses.append(client.get(url))
+    return responses
+
+
+class TestFastSerialization:
+
+    @pytest.mark.parametrize('endpoint', ENDPOINTS)
+    def test_parity(self, api_client, catalog, settings, endpoint):
+        url = API_URL + endpoint.format(**catalog)
+        slow, fast = get_both(api_client, settings, url)
+
+        assert slow.status_code == 200
+        assert fast.status_code == slow.status_code
+        assert fast.content == slow.content, (
+            f'Проверьте, что ответ {url} с FAST_SERIALIZATION совпадает '
+            f'с ответом сериализатора DRF побайтно'
+        )
+
+    @pytest.mark.parametrize('endpoint', NOT_FOUND_ENDPOINTS)
+    def test_not_found_parity(self, api_client, catalog, settings, endpoint):
+        url = API_URL + endpoint.format(**catalog)
+        slow, fast = get_both(api_client, settings, url)
+
+        assert slow.status_code == 404
+        assert fast.status_code == slow.status_code
+        assert fast.content == slow.content
+
+    @pytest.mark.parametrize('resource', ('reviews', 'comments'))
+    def test_cursor_pages_parity(self, api_client, catalog, settings,
+                                 resource):
+        # Курсоры следующих страниц строятся по строкам .values() в быстром
+        # режиме и по объектам моделей в обычном.
+        if resource == 'reviews':
+            url = f'{API_URL}titles/{catalog["title"]}/reviews/?cursor='
+        else:
+            url = (
+                f'{API_URL}titles/{catalog["title"]}/reviews/'
+                f'{catalog["review"]}/comments/?cursor='
+            )
+        pages = 0
+        while url:
+            slow, fast = get_both(api_client, settings, url)
+            assert fast.content == slow.content
+            url = slow.json()['next']
+            pages += 1
+        assert pages > 1
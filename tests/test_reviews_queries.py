@@ -0,0 +1,58 @@
+import pytest
+
+from reviews.models import Comment, Review
+from yamdb.models import Category, Title
+
+REVIEWS_COUNT = 15
+
+
+@pytest.fixture
+def review_pages(db, django_user_model):
+    title = Title.objects.create(
+        name='Произведение',
+        year=2000,
+        category=Category.objects.create(name='Книги', slug='books'),
+    )
+    reviews = []
+    for index in range(REVIEWS_COUNT):
+        author = django_user_model.objects.create(
+            username=f'author{index}', email=f'author{index}@example.com'
+        )
+        review = Review.objects.create(
+            title=title, author=author, text=f'Отзыв {index}', score=5
+        )
+        Comment.objects.create(
+            review=review, author=author, text=f'Комментарий {index}'
+        )
+        reviews.append(review)
+    return {
+        'reviews': f'/api/v1/titles/{title.id}/reviews/',
+        'comments': (
+            f'/api/v1/titles/{title.id}/reviews/{reviews[0].id}/comments/'
+        ),
+    }
+
+
+class TestCursorQueries:
+
+    @pytest.mark.parametrize('resource', ('reviews', 'comments'))
+    def test_cursor_page(self, client, review_pages,
+                         django_assert_num_queries, resource):
+        # Страница по курсору - один запрос: ETag строится по поколениям
+        # кэша, а число записей без count=true не считается.
+        with django_assert_num_queries(1):
+            response = client.get(review_pages[resource], {'cursor': ''})
+
+        assert response.status_code == 200
+        assert response.json()['count'] is None
+        assert response.has_header('ETag')
+
+    def test_cursor_page_with_count(self, client, review_pages,
+                                    django_assert_num_queries):
+        with django_assert_num_queries(2):
+            response = client.get(
+                review_pages['reviews'], {'cursor': '', 'count': 'true'}
+            )
+
+        assert response.status_code == 200
+        assert response.json()['count'] == REVIEWS_COUNT
@@ -0,0 +1,115 @@
+import pytest
+
+from yamdb.models import Category, Genre, Title
+
+TITLES_URL = '/api/v1/titles/'
+TITLES_COUNT = 30
+# ETag строится по поколениям кэша без запросов: остаются число
+# произведений и страница вместе с витриной, от размера страницы число
+# запросов не зависит.
+LIST_QUERIES = 2
+# Число произведений закэшировано под поколением titles-count: другая
+# страница того же списка - один запрос.
+CACHED_COUNT_QUERIES = 1
+# Повторный запрос отдается из кэша ответов, ETag - из поколений в кэше.
+CACHED_QUERIES = 0
+DETAIL_QUERIES = 1
+
+
+@pytest.fixture
+def titles(db):
+    categories = [
+        Category.objects.create(name=f'Категория {index}', slug=f'c{index}')
+        for index in range(3)
+    ]
+    # Жанры создаются в обратном порядке slug: порядок в ответе не
+    # должен зависеть от порядка создания.
+    genres = [
+        Genre.objects.create(name=f'Жанр {index}', slug=f'g{index}')
+        for index in reversed(range(4))
+    ]
+    titles = []
+    for index in range(TITLES_COUNT):
+        title = Title.objects.create(
+            name=f'Произведение {index}',
+            year=1990 + index,
+            description=f'Описание {index}',
+            category=categories[index % len(categories)],
+        )
+        title.genre.set(genres[:1 + index % len(genres)])
+        titles.append(title)
+    return titles
+
+
+class TestTitlesQueries:
+
+    @pytest.mark.parametrize('params, page_size', [
+        ({}, 5),
+        ({'limit': 1}, 1),
+        ({'limit': 10}, 10),
+        ({'limit': TITLES_COUNT}, TITLES_COUNT),
+        ({'limit': 10, 'offset': 25}, 5),
+    ])
+    def test_list(self, client, titles, django_assert_num_queries, params,
+                  page_size):
+        with django_assert_num_queries(LIST_QUERIES):
+            response = client.get(TITLES_URL, params)
+
+        assert response.status_code == 200
+        results = response.json()['results']
+        assert len(results) == page_size, (
+            'Проверьте размер страницы списка произведений'
+        )
+        for result in results:
+            assert result['category'] is not None and result['genre'], (
+                'Проверьте, что категория и жанры приходят в списке '
+                'произведений без дополнительных запросов'
+            )
+
+    def test_list_cached_count(self, client, titles,
+                               django_assert_num_queries):
+        client.get(TITLES_URL, {'limit': 5})
+        with django_assert_num_queries(CACHED_COUNT_QUERIES):
+            response = client.get(TITLES_URL, {'limit': 10, 'offset': 5})
+
+        assert response.status_code == 200
+        assert response.json()['count'] == TITLES_COUNT
+
+    def test_cached_response(self, client, titles,
+                             django_assert_num_queries):
+        for url in (TITLES_URL, f'{TITLES_URL}{titles[0].id}/'):
+            first = client.get(url)
+            with django_assert_num_queries(CACHED_QUERIES):
+                response = client.get(url)
+
+            assert response.status_code == 200
+            assert response.content == first.content
+            assert response['ETag'] == first['ETag']
+
+    def test_list_count_is_not_exact(self, client, titles):
+        # Произведение, созданное в обход API, не сбрасывает поколение
+        # titles-count: число остается прежним до сброса или истечения кэша.
+        client.get(TITLES_URL, {'limit': 5})
+        Title.objects.create(
+            name='Без сброса', year=2021, category=titles[0].category
+        )
+
+        response = client.get(TITLES_URL, {'limit': 10})
+        assert response.json()['count'] == TITLES_COUNT, (
+            'Проверьте, что число произведений в списке берется из кэша, '
+            'а не считается на каждый запрос'
+        )
+
+    def test_detail(self, client, titles, django_assert_num_queries):
+        title = titles[3]
+        with django_assert_num_queries(DETAIL_QUERIES):
+            response = client.get(f'{TITLES_URL}{title.id}/')
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data['category'] == {
+            'name': title.category.name, 'slug': title.category.slug
+        }
+        assert [genre['slug'] for genre in data['genre']] == [
+            genre.slug for genre in title.genre.order_by('slug')
+        ], 'Проверьте, что жанры произведения упорядочены по slug'